@@ -0,0 +1,459 @@
+#!/usr/bin/env python
+"""
+Benchmark the Telegram bot offline
+Starts a fake Django API and a fake Telegram Bot API on localhost, drives
+TelegramNotifier through a notification burst and a command flood, and writes
+machine-readable results that can be compared between runs.
+
+    python benchmark_telegram_bot.py --articles 500 --commands 300
+    python benchmark_telegram_bot.py --compare benchmark_results.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+BOT_TOKEN = "123456:BENCHMARK"
+NOTIFY_CHAT_ID = "1000"
+COMMANDS = ("/stats", "/keywords", "/help")
+
+# Results compared by --compare: (section, key, higher_is_better)
+COMPARED_METRICS = (
+    ("notifications", "notifications_per_second", True),
+    ("commands", "p50_ms", False),
+    ("commands", "p99_ms", False),
+    ("commands", "commands_per_second", True),
+    ("memory", "peak_rss_mb", False),
+)
+
+
+class FakeDjangoAPI:
+    """Stand-in for /api/stats/, /api/articles/ and /api/keywords/"""
+
+    def __init__(self, archive_size, article_bytes, keywords, latency, stats_endpoint):
+        self.latency = latency
+        self.stats_endpoint = stats_endpoint
+        now = datetime.now(timezone.utc)
+        sources = ["https://news.am", "https://armenpress.am", "https://tert.am", "https://panorama.am"]
+        filler = "Հ" * max(0, article_bytes // 2)
+        self.articles_body = json.dumps([
+            {
+                'id': i,
+                'title': f"Հոդված {i}",
+                'content': filler,
+                'link': f"{random.choice(sources)}/news/{i}",
+                'source_url': random.choice(sources),
+                'created_at': (now - timedelta(minutes=17 * i)).isoformat(),
+            }
+            for i in range(archive_size)
+        ], ensure_ascii=False).encode('utf-8')
+        self.keywords = [{'id': i, 'word': f"բառ{i}"} for i in range(keywords)]
+        # Articles added after start-up, served to ?since_id= feed polls
+        self.archive_size = archive_size
+        self.published = []
+
+    def publish(self, title, link):
+        """Add a new article for the feed (call on the fake servers' loop or before polling)"""
+        self.published.append({
+            'id': self.archive_size + len(self.published), 'title': title, 'link': link,
+            'source_url': link, 'created_at': datetime.now(timezone.utc).isoformat(),
+        })
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get('/api/stats/', self.stats)
+        app.router.add_get('/api/articles/', self.articles)
+        app.router.add_get('/api/keywords/', self.get_keywords)
+        app.router.add_post('/api/keywords/', self.add_keyword)
+        app.router.add_delete('/api/keywords/{word}/', self.remove_keyword)
+        return app
+
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    @staticmethod
+    def _conditional(request, body):
+        """Serve a JSON body with an ETag, answering 304 when the client already has it"""
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, content_type='application/json', headers={'ETag': etag})
+
+    async def stats(self, request):
+        await self._delay()
+        if not self.stats_endpoint:
+            return web.Response(status=404)
+        return self._conditional(request, json.dumps({
+            'articles_24h': 10, 'articles_week': 70, 'total_articles': 1000,
+            'total_keywords': len(self.keywords),
+            'top_sources': [{'source_url': 'https://news.am', 'count': 30}],
+        }).encode('utf-8'))
+
+    async def articles(self, request):
+        await self._delay()
+        if 'since_id' in request.query:
+            since_id = int(request.query['since_id'])
+            return web.json_response([a for a in self.published if a['id'] > since_id])
+        return self._conditional(request, self.articles_body)
+
+    async def get_keywords(self, request):
+        await self._delay()
+        if 'page' not in request.query:
+            return self._conditional(request, json.dumps(self.keywords, ensure_ascii=False).encode('utf-8'))
+        # DRF-style page number pagination
+        page, page_size = int(request.query['page']), int(request.query.get('page_size', 20))
+        results = self.keywords[(page - 1) * page_size:page * page_size]
+        if page > 1 and not results:
+            return web.Response(status=404)
+        return web.json_response({'count': len(self.keywords), 'results': results})
+
+    async def add_keyword(self, request):
+        await self._delay()
+        data = await request.json()
+        return web.json_response({'id': len(self.keywords), 'word': data.get('word')}, status=201)
+
+    async def remove_keyword(self, request):
+        await self._delay()
+        return web.json_response({'deleted_count': 1})
+
+
+class FakeTelegramAPI:
+    """Stand-in for the Telegram Bot API (sendMessage, getUpdates and friends)
+
+    Records every sendMessage and measures command latency: commands pushed
+    with `push_command` are matched, per chat and in order, to the next reply
+    sent to that chat.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.messages = 0
+        self.articles_delivered = 0
+        self.command_latencies = []
+        self._awaiting_reply = defaultdict(deque)
+        self._updates = []
+        self._next_update_id = 1
+        self._loop = None
+        self._new_updates = None
+
+    def app(self):
+        app = web.Application()
+        app.router.add_route('*', '/bot{token}/{method}', self.handle)
+        return app
+
+    async def handle(self, request):
+        method = request.match_info['method']
+        if request.content_type == 'application/json' and request.can_read_body:
+            data = await request.json()
+        else:
+            data = dict(await request.post())
+
+        if method == 'getUpdates':
+            return web.json_response({'ok': True, 'result': await self._get_updates(data)})
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if method == 'getMe':
+            return web.json_response({'ok': True, 'result': {
+                'id': 123456, 'is_bot': True, 'first_name': 'Benchmark', 'username': 'benchmark_bot'}})
+        if method in ('sendMessage', 'editMessageText'):
+            return web.json_response({'ok': True, 'result': self._record_message(data)})
+        return web.json_response({'ok': True, 'result': True})
+
+    def _record_message(self, data):
+        chat_id = str(data.get('chat_id'))
+        text = data.get('text', '')
+        self.messages += 1
+        if chat_id == NOTIFY_CHAT_ID:
+            if text.startswith("📰 Նոր հոդվածներ ("):
+                self.articles_delivered += int(text.split('(', 1)[1].split(')', 1)[0])
+            else:
+                self.articles_delivered += 1
+        elif self._awaiting_reply[chat_id]:
+            self.command_latencies.append(time.perf_counter() - self._awaiting_reply[chat_id].popleft())
+        return {
+            'message_id': self.messages, 'date': int(time.time()), 'text': text,
+            'chat': {'id': int(chat_id), 'type': 'private'},
+        }
+
+    async def _get_updates(self, data):
+        offset = int(data.get('offset') or 0)
+        timeout = float(data.get('timeout') or 0)
+        self._updates = [update for update in self._updates if update['update_id'] >= offset]
+        if not self._updates and timeout:
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._new_updates.clear()
+        return self._updates[:100]
+
+    def push_command(self, chat_id, text):
+        """Queue a command update for getUpdates (thread-safe)"""
+        self._loop.call_soon_threadsafe(self._push, str(chat_id), text)
+
+    def _push(self, chat_id, text):
+        command_length = len(text.split()[0])
+        self._updates.append({
+            'update_id': self._next_update_id,
+            'message': {
+                'message_id': self._next_update_id, 'date': int(time.time()), 'text': text,
+                'chat': {'id': int(chat_id), 'type': 'private'},
+                'from': {'id': int(chat_id), 'is_bot': False, 'first_name': 'Bench'},
+                'entities': [{'type': 'bot_command', 'offset': 0, 'length': command_length}],
+            },
+        })
+        self._next_update_id += 1
+        self._awaiting_reply[chat_id].append(time.perf_counter())
+        self._new_updates.set()
+
+
+def start_fake_servers(django_api, telegram_api):
+    """Run both fake servers on their own event loop thread; returns their base URLs"""
+    ready = threading.Event()
+    urls = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        telegram_api._loop = loop
+        telegram_api._new_updates = asyncio.Event()
+
+        async def serve(app):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            return f"http://127.0.0.1:{port}"
+
+        urls['django'] = loop.run_until_complete(serve(django_api.app()))
+        urls['telegram'] = loop.run_until_complete(serve(telegram_api.app()))
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, name="benchmark-fake-servers", daemon=True).start()
+    ready.wait()
+    return urls
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024, 1)
+
+
+def wait_until(predicate, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+def run_notification_burst(notifier, telegram_api, args):
+    from telegram_bot import NotificationQueue
+
+    # Rate limits are set per run so the benchmark can measure either raw
+    # code throughput or behaviour under Telegram's real limits
+    notifier._notification_queue = NotificationQueue(
+        notifier._ensure_loop(), notifier._deliver_article, notifier._deliver_digest,
+        maxsize=max(args.articles, 1), global_rate=args.global_rate, global_burst=max(1, int(args.global_rate)),
+        chat_rate=args.chat_rate, chat_burst=max(1, int(args.chat_rate)),
+    )
+    run_id = int(time.time() * 1000)
+    articles = [
+        {'title': f"Հոդված {i}", 'link': f"https://news.am/bench/{run_id}/{i}",
+         'created_at': datetime.now(timezone.utc).isoformat()}
+        for i in range(args.articles)
+    ]
+
+    messages_before = telegram_api.messages
+    started = time.perf_counter()
+    accepted = sum(1 for article in articles if notifier.enqueue(article, ['բառ1']))
+    completed = wait_until(lambda: telegram_api.articles_delivered >= accepted, args.timeout)
+    elapsed = time.perf_counter() - started
+
+    stats = notifier.queue_stats()
+    return {
+        'articles': args.articles,
+        'accepted': accepted,
+        'delivered': telegram_api.articles_delivered,
+        'completed': completed,
+        'elapsed_s': round(elapsed, 4),
+        'notifications_per_second': round(telegram_api.articles_delivered / elapsed, 1) if elapsed else None,
+        'messages_sent': telegram_api.messages - messages_before,
+        'digests': stats['digests'],
+        'dropped': stats['dropped'],
+        'failed': stats['failed'],
+    }
+
+
+def run_command_flood(notifier, telegram_api, args):
+    updater = notifier.build_updater()
+    updater.start_polling(poll_interval=0, timeout=1)
+    try:
+        # Warm up the polling loop and the API connection pool
+        telegram_api.push_command(1, "/help")
+        wait_until(lambda: len(telegram_api.command_latencies) >= 1, args.timeout)
+        telegram_api.command_latencies.clear()
+
+        started = time.perf_counter()
+        for i in range(args.commands):
+            telegram_api.push_command(1 + i % args.chats, random.choice(COMMANDS))
+        completed = wait_until(lambda: len(telegram_api.command_latencies) >= args.commands, args.timeout)
+        elapsed = time.perf_counter() - started
+    finally:
+        updater.stop()
+
+    latencies = telegram_api.command_latencies
+    to_ms = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        'commands': args.commands,
+        'replied': len(latencies),
+        'completed': completed,
+        'elapsed_s': round(elapsed, 4),
+        'commands_per_second': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': to_ms(percentile(latencies, 50)),
+        'p99_ms': to_ms(percentile(latencies, 99)),
+        'max_ms': to_ms(max(latencies) if latencies else None),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(current, previous_path):
+    """Print the change of each compared metric against a previous results file"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+
+    print(f"\nCompared with {previous_path} ({previous.get('git_commit')}, {previous.get('timestamp')}):")
+    for section, key, higher_is_better in COMPARED_METRICS:
+        old = previous.get('results', {}).get(section, {}).get(key)
+        new = current['results'].get(section, {}).get(key)
+        if old in (None, 0) or new is None:
+            print(f"  {section}.{key}: {old} -> {new}")
+            continue
+        change = (new - old) / old * 100
+        better = (change > 0) == higher_is_better
+        print(f"  {section}.{key}: {old} -> {new} ({change:+.1f}%, {'better' if better else 'worse'})")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline throughput and latency benchmark for TelegramNotifier")
+    parser.add_argument('--articles', type=int, default=500, help="articles in the notification burst")
+    parser.add_argument('--commands', type=int, default=300, help="commands in the command flood")
+    parser.add_argument('--chats', type=int, default=20, help="distinct chats sending commands")
+    parser.add_argument('--archive-size', type=int, default=2000, help="articles returned by /api/articles/")
+    parser.add_argument('--article-bytes', type=int, default=2000, help="approximate size of each article body")
+    parser.add_argument('--keywords', type=int, default=200, help="keywords returned by /api/keywords/")
+    parser.add_argument('--stats-endpoint', action='store_true',
+                        help="serve /api/stats/ (by default it 404s and the articles fallback is used)")
+    parser.add_argument('--api-latency-ms', type=float, default=20, help="added latency of the fake Django API")
+    parser.add_argument('--telegram-latency-ms', type=float, default=5, help="added latency of the fake Telegram API")
+    parser.add_argument('--global-rate', type=float, default=1000, help="global notification rate limit (msg/s)")
+    parser.add_argument('--chat-rate', type=float, default=1000, help="per-chat notification rate limit (msg/s)")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds to wait for each phase")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the JSON results")
+    parser.add_argument('--compare', metavar='PREVIOUS_JSON', help="results file of an earlier run to compare with")
+    parser.add_argument('--verbose', action='store_true', help="show the bot's log output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    level = logging.INFO if args.verbose else logging.CRITICAL
+    logging.basicConfig(level=level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Some libraries set their own logger levels, so filter at the handler too
+    for handler in logging.getLogger().handlers:
+        handler.setLevel(level)
+
+    django_api = FakeDjangoAPI(args.archive_size, args.article_bytes, args.keywords,
+                               args.api_latency_ms / 1000, args.stats_endpoint)
+    telegram_api = FakeTelegramAPI(args.telegram_latency_ms / 1000)
+    urls = start_fake_servers(django_api, telegram_api)
+
+    state_dir = tempfile.mkdtemp(prefix='telegram-bot-bench-')
+    # telegram_bot reads its configuration at import time
+    os.environ.update({
+        'TELEGRAM_BOT_TOKEN': BOT_TOKEN,
+        'TELEGRAM_CHAT_ID': NOTIFY_CHAT_ID,
+        'DJANGO_API_URL': urls['django'],
+        'TELEGRAM_API_URL': urls['telegram'],
+        'BOT_STATE_DB': os.path.join(state_dir, 'state.db'),
+    })
+    from telegram_bot import TelegramNotifier
+
+    notifier = TelegramNotifier()
+    try:
+        notifications = run_notification_burst(notifier, telegram_api, args)
+        print(f"Notifications: {notifications['notifications_per_second']}/s "
+              f"({notifications['delivered']}/{notifications['articles']} in {notifications['elapsed_s']}s, "
+              f"{notifications['messages_sent']} messages)")
+        commands = run_command_flood(notifier, telegram_api, args)
+        print(f"Commands: p50 {commands['p50_ms']} ms, p99 {commands['p99_ms']} ms, "
+              f"{commands['commands_per_second']}/s ({commands['replied']}/{commands['commands']} replied)")
+    finally:
+        notifier.shutdown()
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'params': {key: value for key, value in vars(args).items() if key not in ('output', 'compare', 'verbose')},
+        'results': {
+            'notifications': notifications,
+            'commands': commands,
+            # Includes the in-process fake servers
+            'memory': {'peak_rss_mb': peak_rss_mb()},
+        },
+    }
+    print(f"Peak RSS: {results['results']['memory']['peak_rss_mb']} MB")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return results
+
+
+if __name__ == '__main__':
+    main()
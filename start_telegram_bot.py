@@ -5,6 +5,7 @@ This script starts the Telegram bot server.
 """
 
 import logging
+import time
 
 # Configure logging
 logging.basicConfig(
@@ -16,12 +17,31 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Start the Telegram bot"""
+    started = time.perf_counter()
     try:
         logger.info("🤖 Telegram բոտը սկսվում է...")
         
-        from telegram_bot import TelegramNotifier
+        # telegram_bot imports only what the first poll needs; sqlite3 and the source
+        # names file load during the pre-warm (timed as warm_up.*), multiprocessing
+        # only in worker mode
+        from telegram_bot import NOTIFICATION_WORKERS, TelegramNotifier, WorkerSupervisor
+        timings = {'import': time.perf_counter() - started}
+
+        phase = time.perf_counter()
         notifier = TelegramNotifier()
-        notifier.start_bot_server()
+        timings['init'] = time.perf_counter() - phase
+
+        # With NOTIFICATION_WORKERS > 0 this process polls for commands and
+        # the worker processes deliver the notifications
+        supervisor = None
+        if NOTIFICATION_WORKERS > 0:
+            supervisor = WorkerSupervisor(NOTIFICATION_WORKERS)
+            supervisor.start()
+        try:
+            notifier.start_bot_server(timings=timings, started=started)
+        finally:
+            if supervisor is not None:
+                supervisor.stop()
         
     except KeyboardInterrupt:
         logger.info("🛑 Telegram բոտը կանգնեցված է")
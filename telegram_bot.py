@@ -7,10 +7,25 @@ if sys.version_info >= (3, 11):
     sys.modules['imghdr'] = imghdr
 
 import asyncio
+import codecs
+import functools
+import hashlib
+import hmac
 import logging
+import math
 import os
-from telegram import Bot, Update
-import requests
+import random
+import re
+import secrets
+import signal
+import threading
+import time
+import unicodedata
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+from telegram import Bot
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
 import json
 
 logger = logging.getLogger(__name__)
@@ -18,6 +33,1649 @@ logger = logging.getLogger(__name__)
 # API configuration
 API_BASE_URL = os.environ.get('DJANGO_API_URL', "https://beackkayq.onrender.com")
 
+# Telegram Bot API server; override to use a local Bot API server or a test double
+TELEGRAM_API_URL = os.environ.get('TELEGRAM_API_URL', '').strip().rstrip('/')
+
+# Connection pool settings for the Django API (keep-alive, shared by all API calls)
+API_TIMEOUT = float(os.environ.get('DJANGO_API_TIMEOUT', 10))
+API_CONNECT_TIMEOUT = float(os.environ.get('DJANGO_API_CONNECT_TIMEOUT', 5))
+API_POOL_SIZE = int(os.environ.get('DJANGO_API_POOL_SIZE', 20))
+API_POOL_PER_HOST = int(os.environ.get('DJANGO_API_POOL_PER_HOST', 10))
+API_DNS_CACHE_TTL = int(os.environ.get('DJANGO_API_DNS_CACHE_TTL', 300))
+API_KEEPALIVE_TIMEOUT = float(os.environ.get('DJANGO_API_KEEPALIVE_TIMEOUT', 60))
+
+# Outbound notification limits. Telegram allows about 30 messages per second
+# overall and about one message per second to the same chat (20 per minute in groups).
+TELEGRAM_GLOBAL_RATE = float(os.environ.get('TELEGRAM_GLOBAL_RATE', 25))
+TELEGRAM_GLOBAL_BURST = int(os.environ.get('TELEGRAM_GLOBAL_BURST', 25))
+TELEGRAM_CHAT_RATE = float(os.environ.get('TELEGRAM_CHAT_RATE', 1))
+TELEGRAM_CHAT_BURST = int(os.environ.get('TELEGRAM_CHAT_BURST', 3))
+# Groups and channels (negative chat ids): burst + 60 * rate stays within 20 per minute
+TELEGRAM_GROUP_CHAT_RATE = float(os.environ.get('TELEGRAM_GROUP_CHAT_RATE', 18 / 60))
+TELEGRAM_GROUP_CHAT_BURST = int(os.environ.get('TELEGRAM_GROUP_CHAT_BURST', 2))
+NOTIFICATION_QUEUE_SIZE = int(os.environ.get('NOTIFICATION_QUEUE_SIZE', 1000))
+DIGEST_THRESHOLD = int(os.environ.get('NOTIFICATION_DIGEST_THRESHOLD', 5))
+DIGEST_MAX_ARTICLES = int(os.environ.get('NOTIFICATION_DIGEST_MAX_ARTICLES', 10))
+MAX_MESSAGE_LENGTH = 4096
+
+# Keyword cache: fresh for KEYWORDS_CACHE_TTL seconds, then served stale for up to
+# KEYWORDS_CACHE_STALE_TTL more seconds while it is refreshed in the background
+KEYWORDS_CACHE_TTL = float(os.environ.get('KEYWORDS_CACHE_TTL', 60))
+KEYWORDS_CACHE_STALE_TTL = float(os.environ.get('KEYWORDS_CACHE_STALE_TTL', 3600))
+# /keywords shows this many keywords per page; pages are requested from the API
+# as ?page=N&page_size=KEYWORDS_PAGE_SIZE and cached for KEYWORDS_CACHE_TTL seconds
+KEYWORDS_PAGE_SIZE = int(os.environ.get('KEYWORDS_PAGE_SIZE', 20))
+KEYWORD_DISPLAY_LIMIT = 100
+# /add_keywords and /remove_keywords: at most BULK_KEYWORDS_LIMIT words per command,
+# sent as one batch request when the API supports it, else BULK_KEYWORDS_CONCURRENCY at a time
+BULK_KEYWORDS_LIMIT = int(os.environ.get('BULK_KEYWORDS_LIMIT', 200))
+BULK_KEYWORDS_CONCURRENCY = int(os.environ.get('BULK_KEYWORDS_CONCURRENCY', 5))
+
+# How the bot receives updates: "polling" (default) or "webhook"
+TELEGRAM_UPDATE_MODE = os.environ.get('TELEGRAM_UPDATE_MODE', 'polling').strip().lower()
+# Public base URL Telegram should call; when empty the webhook is not (re)registered
+TELEGRAM_WEBHOOK_URL = os.environ.get('TELEGRAM_WEBHOOK_URL', '').strip().rstrip('/')
+TELEGRAM_WEBHOOK_PATH = os.environ.get('TELEGRAM_WEBHOOK_PATH', '/telegram/webhook')
+TELEGRAM_WEBHOOK_HOST = os.environ.get('TELEGRAM_WEBHOOK_HOST', '0.0.0.0')
+# An explicit TELEGRAM_WEBHOOK_PORT wins over the PORT set by the hosting platform
+TELEGRAM_WEBHOOK_PORT = int(os.environ.get('TELEGRAM_WEBHOOK_PORT') or os.environ.get('PORT') or 8443)
+TELEGRAM_WEBHOOK_SECRET = os.environ.get('TELEGRAM_WEBHOOK_SECRET', '').strip()
+
+# Command execution: at most COMMAND_CONCURRENCY commands run at once, and at
+# most COMMAND_QUEUE_LIMIT wait; commands of one chat always run in order
+COMMAND_CONCURRENCY = int(os.environ.get('COMMAND_CONCURRENCY', 8))
+COMMAND_QUEUE_LIMIT = int(os.environ.get('COMMAND_QUEUE_LIMIT', 100))
+
+# Resilience for upstream calls: retries with jittered exponential backoff,
+# a total deadline per call and a circuit breaker per upstream
+UPSTREAM_RETRY_ATTEMPTS = int(os.environ.get('UPSTREAM_RETRY_ATTEMPTS', 3))
+UPSTREAM_RETRY_BASE_DELAY = float(os.environ.get('UPSTREAM_RETRY_BASE_DELAY', 0.5))
+UPSTREAM_RETRY_MAX_DELAY = float(os.environ.get('UPSTREAM_RETRY_MAX_DELAY', 10))
+DJANGO_API_DEADLINE = float(os.environ.get('DJANGO_API_DEADLINE', 20))
+TELEGRAM_SEND_DEADLINE = float(os.environ.get('TELEGRAM_SEND_DEADLINE', 30))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', 5))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('BREAKER_RESET_TIMEOUT', 30))
+
+# Prometheus-style metrics endpoint (METRICS_PORT=0 disables it)
+METRICS_HOST = os.environ.get('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.environ.get('METRICS_PORT', 9464))
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Local state database (already-notified articles, ...)
+BOT_STATE_DB = os.environ.get('BOT_STATE_DB', 'telegram_bot_state.db')
+SEEN_ARTICLES_TTL = float(os.environ.get('SEEN_ARTICLES_TTL', 30 * 24 * 3600))
+SEEN_BLOOM_CAPACITY = int(os.environ.get('SEEN_BLOOM_CAPACITY', 100000))
+SEEN_BLOOM_ERROR_RATE = float(os.environ.get('SEEN_BLOOM_ERROR_RATE', 0.01))
+# Per-chat keyword subscriptions (/subscribe): at most this many keywords per chat
+SUBSCRIPTION_KEYWORDS_LIMIT = int(os.environ.get('SUBSCRIPTION_KEYWORDS_LIMIT', 200))
+# Articles suppressed by /pause are kept in an on-disk outbox; /resume sends them
+# per chat as one digest listing at most RESUME_DIGEST_MAX_ARTICLES articles
+RESUME_DIGEST_MAX_ARTICLES = int(os.environ.get('RESUME_DIGEST_MAX_ARTICLES', 50))
+OUTBOX_ARTICLE_FIELDS = ('title', 'link', 'source_url')
+JOB_ARTICLE_FIELDS = ('title', 'link', 'source_url', 'created_at')
+
+# Article feed: the bot polls /api/articles/?since_id=<cursor> itself. The poll interval
+# starts at ARTICLE_FEED_MIN_INTERVAL and doubles while nothing new arrives, up to
+# ARTICLE_FEED_MAX_INTERVAL. Off by default while the Django side still pushes articles.
+ARTICLE_FEED_ENABLED = os.environ.get('ARTICLE_FEED_ENABLED', '0').strip().lower() in ('1', 'true', 'yes')
+ARTICLE_FEED_MIN_INTERVAL = float(os.environ.get('ARTICLE_FEED_MIN_INTERVAL', 5))
+ARTICLE_FEED_MAX_INTERVAL = float(os.environ.get('ARTICLE_FEED_MAX_INTERVAL', 120))
+ARTICLE_FEED_PAGE_SIZE = int(os.environ.get('ARTICLE_FEED_PAGE_SIZE', 100))
+# The cursor stays before an article whose notification failed, for at most this many polls
+ARTICLE_FEED_MAX_RETRIES = int(os.environ.get('ARTICLE_FEED_MAX_RETRIES', 5))
+
+# Worker mode: with NOTIFICATION_WORKERS > 0, notifications go to a job queue in the
+# state database and are delivered by that many separate worker processes. A worker
+# leases all pending jobs of a chat for JOB_LEASE_SECONDS (renewed while it works),
+# so each chat is served by one worker at a time.
+NOTIFICATION_WORKERS = int(os.environ.get('NOTIFICATION_WORKERS', 0))
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', 60))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 0.5))
+JOB_CLAIM_CHATS = int(os.environ.get('JOB_CLAIM_CHATS', 8))
+# A job whose send failed is offered to the workers again after this many seconds
+# (its chat waits meanwhile), until it has been tried JOB_MAX_ATTEMPTS times
+JOB_RETRY_DELAY = float(os.environ.get('JOB_RETRY_DELAY', 30))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+WORKER_RESTART_MAX_DELAY = float(os.environ.get('WORKER_RESTART_MAX_DELAY', 60))
+
+# Article stats fallback: read /api/articles/ in chunks of this size
+ARTICLES_STREAM_CHUNK_SIZE = 64 * 1024
+TOP_SOURCES_LIMIT = 5
+# Source names: extra "domain": "name" mappings are read from SOURCE_NAMES_FILE (JSON)
+# and re-read when it changes, checked at most every SOURCE_NAMES_RELOAD_INTERVAL seconds
+SOURCE_NAMES_FILE = os.environ.get('SOURCE_NAMES_FILE', 'source_names.json')
+SOURCE_NAMES_RELOAD_INTERVAL = float(os.environ.get('SOURCE_NAMES_RELOAD_INTERVAL', 30))
+SOURCE_NAME_CACHE_SIZE = int(os.environ.get('SOURCE_NAME_CACHE_SIZE', 4096))
+# Computed stats are reused for this many seconds (also keeps the startup pre-warm useful)
+STATS_CACHE_TTL = float(os.environ.get('STATS_CACHE_TTL', 30))
+# GET responses carrying an ETag or Last-Modified are kept (up to HTTP_CACHE_SIZE URLs)
+# and revalidated with If-None-Match / If-Modified-Since. Article counts depend on the
+# current time, so article pages are only revalidated for ARTICLES_REVALIDATE_MAX_AGE seconds.
+HTTP_CACHE_SIZE = int(os.environ.get('HTTP_CACHE_SIZE', 256))
+ARTICLES_REVALIDATE_MAX_AGE = float(os.environ.get('ARTICLES_REVALIDATE_MAX_AGE', 600))
+
+# Cold start: connection pools and caches are pre-warmed concurrently before
+# commands are accepted, for at most STARTUP_WARMUP_TIMEOUT seconds.
+# BOT_READY_FILE (optional) is created once the bot is ready and removed on shutdown.
+STARTUP_WARMUP_TIMEOUT = float(os.environ.get('STARTUP_WARMUP_TIMEOUT', 15))
+BOT_READY_FILE = os.environ.get('BOT_READY_FILE', '').strip()
+# Connection pool of the Telegram Bot API client, shared by polling and sending
+TELEGRAM_POOL_SIZE = int(os.environ.get('TELEGRAM_POOL_SIZE', 16))
+
+
+# Known news sites and their display names
+SOURCE_NAMES = {
+    'armenpress.am': 'Armenpress',
+    'news.am': 'News.am',
+    'panorama.am': 'Panorama.am',
+    'asbarez.com': 'Asbarez',
+    'aysor.am': 'Aysor',
+    'lurer.com': 'Lurer',
+    'tert.am': 'Tert.am',
+    'armtimes.com': 'Armtimes',
+    'yerkir.am': 'Yerkir',
+    'armlur.am': 'Armlur',
+    'mamul.am': 'Mamul',
+    'past.am': 'Past.am',
+    'armday.am': 'Armday',
+    'hayeli.am': 'Hayeli',
+    'blognews.am': 'Blognews',
+    'slaq.am': 'Slaq',
+    'irakanum.am': 'Irakanum',
+    'norlur.am': 'Norlur',
+    'newday.am': 'Newday',
+    'politik.am': 'Politik',
+    'pastinfo.am': 'Pastinfo',
+    'hayacq.am': 'Hayacq',
+    'yerevan-today.com': 'Yerevan Today',
+    'armeniatoday.news': 'Armenia Today',
+    'armlife.am': 'Armlife',
+    '168.am': '168.am',
+    '7or.am': '7or.am',
+}
+
+
+def _keyword_word(keyword):
+    """Return the text of a keyword in dictionary or object format"""
+    if isinstance(keyword, dict):
+        return keyword.get('word', str(keyword))
+    return keyword.word if hasattr(keyword, 'word') else str(keyword)
+
+
+class _Metric:
+    """Base class for labelled metrics in the Prometheus text format"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _format_labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f"{self.name}{self._format_labels(key)} {value:g}"]
+
+
+class MetricCounter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class MetricGauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class MetricHistogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def _render_value(self, key, state):
+        counts, count, total = state
+        lines = [
+            f"{self.name}_bucket{self._format_labels(key, [('le', f'{bound:g}')])} {bucket_count}"
+            for bound, bucket_count in zip(self.buckets, counts)
+        ]
+        lines.append(f"{self.name}_bucket{self._format_labels(key, [('le', '+Inf')])} {count}")
+        lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        lines.append(f"{self.name}_sum{self._format_labels(key)} {total:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """Minimal metrics registry rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(MetricCounter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(MetricGauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(MetricHistogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+COMMAND_LATENCY = METRICS.histogram(
+    'telegram_bot_command_duration_seconds', 'Command handler latency', ['command'])
+COMMAND_ERRORS = METRICS.counter(
+    'telegram_bot_command_errors_total', 'Command handlers that raised', ['command'])
+API_LATENCY = METRICS.histogram(
+    'telegram_bot_api_request_duration_seconds', 'Django API request latency', ['method', 'endpoint'])
+API_ERRORS = METRICS.counter(
+    'telegram_bot_api_errors_total', 'Failed Django API requests by kind (status, timeout, client_error, circuit_open)',
+    ['method', 'endpoint', 'kind'])
+SEND_LATENCY = METRICS.histogram(
+    'telegram_bot_send_message_duration_seconds', 'Telegram bot.send_message latency')
+SEND_ERRORS = METRICS.counter(
+    'telegram_bot_send_message_errors_total', 'Failed Telegram sends by kind (retry_after, timeout, network, other, circuit_open)',
+    ['kind'])
+NOTIFICATIONS_SENT = METRICS.counter(
+    'telegram_bot_notifications_sent_total', 'Article notifications delivered', ['mode'])
+FEED_ARTICLES = METRICS.counter(
+    'telegram_bot_feed_articles_total', 'New articles read from the article feed')
+NOTIFICATIONS_PAUSED = METRICS.gauge(
+    'telegram_bot_notifications_paused', '1 while notifications are paused, 0 while active')
+QUEUE_STATE = METRICS.gauge(
+    'telegram_bot_notification_queue', 'Outbound notification queue counters', ['field'])
+COMMAND_STATE = METRICS.gauge(
+    'telegram_bot_command_executor', 'Command executor counters', ['field'])
+BREAKER_OPEN = METRICS.gauge(
+    'telegram_bot_circuit_open', '1 while the upstream circuit breaker is open or half-open', ['upstream'])
+
+
+class UpstreamError(Exception):
+    """Retryable failure reported by an upstream service (5xx or 429)"""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Per-upstream circuit breaker
+
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds; then lets a single trial call through (half-open)
+    and closes again if it succeeds.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return 'half_open'
+            return 'open'
+
+    def allow(self):
+        """Return True if a call may go through now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    logger.warning(f"⚡ Circuit breaker '{self.name}' opened")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class RetryPolicy:
+    """Jittered exponential backoff ("full jitter") that honors server-provided retry_after"""
+
+    def __init__(self, attempts=UPSTREAM_RETRY_ATTEMPTS, base_delay=UPSTREAM_RETRY_BASE_DELAY,
+                 max_delay=UPSTREAM_RETRY_MAX_DELAY):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, retry_after=None):
+        if retry_after:
+            return float(retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+async def resilient_call(func, breaker, policy, deadline, is_retryable):
+    """Await `func()` with retries, backoff, a total deadline and a circuit breaker
+
+    `is_retryable(exc)` decides which errors are retried and counted against
+    the breaker; anything else is re-raised immediately.
+    """
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + deadline
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"{breaker.name} circuit is open")
+        attempt += 1
+        try:
+            result = await asyncio.wait_for(func(), max(0.0, give_up_at - loop.time()))
+        except Exception as e:
+            if not is_retryable(e):
+                if isinstance(e, (TimedOut, asyncio.TimeoutError)):
+                    # No answer: counts against the breaker even though it is not retried
+                    breaker.record_failure()
+                else:
+                    # The upstream answered, so it is healthy as far as the breaker is concerned
+                    breaker.record_success()
+                raise
+            if not isinstance(e, RetryAfter):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            delay = policy.delay(attempt, getattr(e, 'retry_after', None))
+            if attempt >= policy.attempts or loop.time() + delay >= give_up_at:
+                raise
+            logger.warning(f"🔁 {breaker.name} call failed ({e!r}), retry {attempt}/{policy.attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+
+
+def _is_retryable_api_error(error):
+    import aiohttp
+    return isinstance(error, (UpstreamError, aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def _is_retryable_telegram_error(error):
+    if isinstance(error, (RetryAfter, TimedOut, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, NetworkError) and not isinstance(error, BadRequest)
+
+
+def _is_retryable_telegram_send_error(error):
+    # A send that timed out has often been delivered already (and a deadline hit by
+    # asyncio.wait_for does not stop the executor thread still sending), so retrying
+    # it could send the notification twice
+    if isinstance(error, (TimedOut, asyncio.TimeoutError)):
+        return False
+    return _is_retryable_telegram_error(error)
+
+
+class TokenBucket:
+    """Token bucket rate limiter for a single event loop"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Drain the bucket so that the next token is available after `seconds`"""
+        self._refill()
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class NotificationQueue:
+    """Rate-limited outbound notification queue with burst coalescing
+
+    Articles are queued per chat and delivered through a global and a per-chat
+    token bucket; group chats (negative ids) get the slower group limits. When a chat's backlog reaches `digest_threshold`, up to
+    `digest_size` queued articles are merged into one digest message.
+    `enqueue` is thread-safe and never blocks; its optional `on_done(ok)`
+    callback runs on the loop once the article was sent (ok=True) or failed.
+    """
+
+    def __init__(self, loop, send_one, send_digest, maxsize=NOTIFICATION_QUEUE_SIZE,
+                 global_rate=TELEGRAM_GLOBAL_RATE, global_burst=TELEGRAM_GLOBAL_BURST,
+                 chat_rate=TELEGRAM_CHAT_RATE, chat_burst=TELEGRAM_CHAT_BURST,
+                 group_rate=TELEGRAM_GROUP_CHAT_RATE, group_burst=TELEGRAM_GROUP_CHAT_BURST,
+                 digest_threshold=DIGEST_THRESHOLD, digest_size=DIGEST_MAX_ARTICLES):
+        self._loop = loop
+        self._send_one = send_one
+        self._send_digest = send_digest
+        self.maxsize = maxsize
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.group_burst = group_burst
+        self.digest_threshold = max(2, digest_threshold)
+        self.digest_size = max(2, digest_size)
+
+        self._global_bucket = TokenBucket(global_rate, global_burst)
+        self._chat_buckets = {}
+        self._pending = {}
+        self._workers = {}
+
+        self._lock = threading.Lock()
+        self._depth = 0
+        self.enqueued = 0
+        self.sent = 0
+        self.digests = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def enqueue(self, chat_id, article, keywords=None, on_done=None):
+        """Queue an article for delivery; returns False if it was dropped"""
+        with self._lock:
+            if self._depth >= self.maxsize:
+                self.dropped += 1
+                return False
+            self._depth += 1
+            self.enqueued += 1
+        self._loop.call_soon_threadsafe(self._push, str(chat_id), article, keywords, on_done)
+        return True
+
+    def stats(self):
+        """Return queue depth and delivery counters"""
+        with self._lock:
+            depth = self._depth
+        return {
+            'depth': depth,
+            'enqueued': self.enqueued,
+            'sent': self.sent,
+            'digests': self.digests,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'active_chats': len(self._workers),
+        }
+
+    async def acquire(self, chat_id):
+        """Wait for send capacity towards `chat_id`"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if str(chat_id).startswith('-'):
+                bucket = TokenBucket(self.group_rate, self.group_burst)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chat_buckets[chat_id] = bucket
+        await bucket.acquire()
+        await self._global_bucket.acquire()
+
+    async def join(self, poll_interval=0.1):
+        """Wait until every queued notification has been sent or has failed"""
+        while self._depth:
+            await asyncio.sleep(poll_interval)
+
+    def _push(self, chat_id, article, keywords, on_done=None):
+        self._pending.setdefault(chat_id, deque()).append((article, keywords, on_done))
+        if chat_id not in self._workers:
+            self._workers[chat_id] = self._loop.create_task(self._drain(chat_id))
+
+    async def _drain(self, chat_id):
+        pending = self._pending[chat_id]
+        try:
+            while pending:
+                await self.acquire(chat_id)
+                count = min(self.digest_size, len(pending)) if len(pending) >= self.digest_threshold else 1
+                batch = [pending.popleft() for _ in range(count)]
+                ok = False
+                try:
+                    if len(batch) == 1:
+                        await self._send_one(chat_id, *batch[0][:2])
+                    else:
+                        await self._send_digest(chat_id, [item[:2] for item in batch])
+                        self.digests += 1
+                    self.sent += len(batch)
+                    ok = True
+                except (RetryAfter, CircuitOpenError) as e:
+                    # Flood control or Telegram outage: put the batch back and hold this chat
+                    retry_after = getattr(e, 'retry_after', BREAKER_RESET_TIMEOUT)
+                    logger.warning(f"⏳ Telegram is not accepting messages, retry after {retry_after}s")
+                    pending.extendleft(reversed(batch))
+                    self._chat_buckets[chat_id].pause(retry_after)
+                    continue
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.error(f"❌ Telegram ծանուցման սխալ: {e}")
+                for _, _, on_done in batch:
+                    if on_done is not None:
+                        on_done(ok)
+                with self._lock:
+                    self._depth -= len(batch)
+        finally:
+            self._workers.pop(chat_id, None)
+            if not pending:
+                self._pending.pop(chat_id, None)
+
+
+class JSONArrayStream:
+    """Incremental parser yielding the elements of a JSON array one at a time
+
+    Accepts either a top-level array or a paginated object whose "results"
+    key holds the array; the other top-level fields are collected into `meta`.
+    Only the element currently being parsed is buffered.
+    """
+
+    _WHITESPACE = re.compile(r'\s*')
+    _INCOMPLETE = object()
+
+    def __init__(self, max_item_size=1024 * 1024):
+        self.max_item_size = max_item_size
+        self.meta = {}
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._state = 'start'
+        self._in_object = False
+        self._key = None
+
+    def feed(self, data, final=False):
+        """Feed a chunk of bytes and return the array elements completed by it"""
+        self._buf = self._buf[self._pos:] + self._text_decoder.decode(data, final)
+        self._pos = 0
+        items = []
+        while self._step(items, final):
+            pass
+        if len(self._buf) - self._pos > self.max_item_size:
+            raise ValueError("JSON array element exceeds max_item_size")
+        if final and self._state != 'done':
+            raise ValueError("Truncated JSON document")
+        return items
+
+    def _peek(self):
+        self._pos = self._WHITESPACE.match(self._buf, self._pos).end()
+        return self._buf[self._pos] if self._pos < len(self._buf) else None
+
+    def _decode(self, final):
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return self._INCOMPLETE
+        if not final and not isinstance(value, (dict, list, str)):
+            # A number cut by a chunk boundary ("-2." + "5", "1e" + "10") decodes as its
+            # prefix, so a scalar is complete only once a delimiter follows it
+            after = self._WHITESPACE.match(self._buf, end).end()
+            if after == len(self._buf) or self._buf[after] not in ',]}':
+                return self._INCOMPLETE
+        self._pos = end
+        return value
+
+    def _step(self, items, final):
+        state = self._state
+        if state == 'done':
+            return False
+        char = self._peek()
+        if char is None:
+            return False
+
+        if state == 'start':
+            if char == '[':
+                self._state = 'array_value'
+            elif char == '{':
+                self._in_object = True
+                self._state = 'object_key'
+            else:
+                raise ValueError("Expected a JSON array or object")
+            self._pos += 1
+        elif state == 'array_value':
+            if char == ']':
+                self._pos += 1
+                self._state = 'object_sep' if self._in_object else 'done'
+                return True
+            value = self._decode(final)
+            if value is self._INCOMPLETE:
+                return False
+            items.append(value)
+            self._state = 'array_sep'
+        elif state == 'array_sep':
+            self._pos += 1
+            if char == ',':
+                self._state = 'array_value'
+            elif char == ']':
+                self._state = 'object_sep' if self._in_object else 'done'
+            else:
+                raise ValueError(f"Unexpected {char!r} in JSON array")
+        elif state == 'object_key':
+            if char == '}':
+                self._pos += 1
+                self._state = 'done'
+                return True
+            key = self._decode(final)
+            if key is self._INCOMPLETE:
+                return False
+            self._key = key
+            self._state = 'object_colon'
+        elif state == 'object_colon':
+            if char != ':':
+                raise ValueError(f"Unexpected {char!r} in JSON object")
+            self._pos += 1
+            self._state = 'object_value'
+        elif state == 'object_value':
+            if self._key == 'results' and char == '[':
+                self._pos += 1
+                self._state = 'array_value'
+                return True
+            value = self._decode(final)
+            if value is self._INCOMPLETE:
+                return False
+            self.meta[self._key] = value
+            self._state = 'object_sep'
+        elif state == 'object_sep':
+            self._pos += 1
+            if char == ',':
+                self._state = 'object_key'
+            elif char == '}':
+                self._state = 'done'
+            else:
+                raise ValueError(f"Unexpected {char!r} in JSON object")
+        return True
+
+
+def _parse_timestamp(value):
+    """Parse an ISO 8601 timestamp into an aware datetime (naive values are taken as UTC)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            try:
+                from dateutil.parser import isoparse
+                parsed = isoparse(str(value))
+            except (ValueError, OverflowError):
+                return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class CommandExecutor:
+    """Bounded-concurrency command runner with per-chat ordering
+
+    Commands from different chats run concurrently, at most `concurrency` at a
+    time; commands from the same chat run strictly one after another in
+    arrival order. `submit` is thread-safe, never blocks, and rejects new
+    commands once `queue_limit` are already waiting.
+    """
+
+    def __init__(self, loop, concurrency=COMMAND_CONCURRENCY, queue_limit=COMMAND_QUEUE_LIMIT):
+        self._loop = loop
+        self.concurrency = concurrency
+        self.queue_limit = queue_limit
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending = {}
+        self._workers = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, chat_id, func, *args):
+        """Schedule `func(*args)` for `chat_id`; returns False if the queue is full"""
+        with self._lock:
+            if self._queued >= self.queue_limit:
+                self.rejected += 1
+                return False
+            self._queued += 1
+        self._loop.call_soon_threadsafe(self._push, chat_id, func, args)
+        return True
+
+    def stats(self):
+        """Return in-flight and queued command counts"""
+        with self._lock:
+            return {
+                'in_flight': self._in_flight,
+                'queued': self._queued,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'concurrency': self.concurrency,
+            }
+
+    def _push(self, chat_id, func, args):
+        self._pending.setdefault(chat_id, deque()).append((func, args))
+        if chat_id not in self._workers:
+            self._workers[chat_id] = self._loop.create_task(self._drain(chat_id))
+
+    async def _drain(self, chat_id):
+        pending = self._pending[chat_id]
+        try:
+            while pending:
+                func, args = pending.popleft()
+                async with self._semaphore:
+                    with self._lock:
+                        self._queued -= 1
+                        self._in_flight += 1
+                    try:
+                        await func(*args)
+                    except Exception as e:
+                        logger.error(f"❌ Command error in {getattr(func, '__name__', func)}: {e}", exc_info=True)
+                    finally:
+                        with self._lock:
+                            self._in_flight -= 1
+                            self.completed += 1
+        finally:
+            self._workers.pop(chat_id, None)
+            if not pending:
+                self._pending.pop(chat_id, None)
+
+
+class KeywordMatcher:
+    """Aho-Corasick multi-keyword matcher for article text
+
+    Keywords and text are NFKC-normalized and case-folded, so Armenian upper
+    and lower case forms match each other; the "և" ligature (case-folded to
+    "եւ") is further spelled out as "եվ", which is how it is capitalized. All
+    keywords are found in a single linear pass over the text. Adding keywords
+    extends the trie in place and only relinks it on the next match; removing
+    keywords just unmarks their terminal nodes, and the trie is compacted once
+    enough of it is dead.
+    """
+
+    def __init__(self, keywords=()):
+        self._lock = threading.Lock()
+        self._reset()
+        for keyword in keywords:
+            self.add(keyword)
+
+    @staticmethod
+    def normalize(text):
+        return unicodedata.normalize('NFKC', text).casefold().replace('եւ', 'եվ')
+
+    def _reset(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._dict_link = [0]
+        self._pattern = [None]
+        self._nodes = {}
+        self._display = {}
+        self._dead = 0
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._display)
+
+    def keywords(self):
+        return list(self._display.values())
+
+    def add(self, keyword):
+        """Add a keyword; returns False if an equivalent keyword is already present"""
+        pattern = self.normalize(keyword).strip()
+        if not pattern:
+            return False
+        with self._lock:
+            if pattern in self._display:
+                return False
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._dict_link.append(0)
+                    self._pattern.append(None)
+                node = nxt
+            self._pattern[node] = pattern
+            self._nodes[pattern] = node
+            self._display[pattern] = keyword.strip()
+            self._dirty = True
+            return True
+
+    def remove(self, keyword):
+        """Remove a keyword; returns False if it was not present"""
+        pattern = self.normalize(keyword).strip()
+        with self._lock:
+            node = self._nodes.pop(pattern, None)
+            if node is None:
+                return False
+            self._pattern[node] = None
+            del self._display[pattern]
+            self._dead += 1
+            if self._dead > max(64, len(self._display)):
+                self._compact()
+            return True
+
+    def sync(self, keywords):
+        """Make the matcher hold exactly `keywords`, applying only the differences"""
+        wanted = {}
+        for keyword in keywords:
+            pattern = self.normalize(keyword).strip()
+            if pattern:
+                wanted.setdefault(pattern, keyword)
+        for pattern in set(self._display) - set(wanted):
+            self.remove(self._display[pattern])
+        for pattern, keyword in wanted.items():
+            if pattern not in self._display:
+                self.add(keyword)
+
+    def _compact(self):
+        live = list(self._display.values())
+        self._reset()
+        for keyword in live:
+            pattern = self.normalize(keyword).strip()
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._pattern.append(None)
+                node = nxt
+            self._pattern[node] = pattern
+            self._nodes[pattern] = node
+            self._display[pattern] = keyword
+        self._fail = [0] * len(self._goto)
+        self._dict_link = [0] * len(self._goto)
+        self._dirty = True
+
+    def _link(self):
+        goto, fail, dict_link, pattern = self._goto, self._fail, self._dict_link, self._pattern
+        queue = deque()
+        for nxt in goto[0].values():
+            fail[nxt] = 0
+            dict_link[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for char, nxt in goto[node].items():
+                f = fail[node]
+                while f and char not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(char, 0)
+                fail[nxt] = target
+                dict_link[nxt] = target if pattern[target] is not None else dict_link[target]
+                queue.append(nxt)
+        self._dirty = False
+
+    def match(self, text):
+        """Return the keywords found in `text`, in order of first occurrence"""
+        if not text:
+            return []
+        text = self.normalize(text)
+        found = {}
+        with self._lock:
+            if self._dirty:
+                self._link()
+            goto, fail, dict_link, pattern = self._goto, self._fail, self._dict_link, self._pattern
+            node = 0
+            for char in text:
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                out = node if pattern[node] is not None else dict_link[node]
+                while out:
+                    hit = pattern[out]
+                    if hit is not None and hit not in found:
+                        found[hit] = True
+                    out = dict_link[out]
+            return [self._display[hit] for hit in found if hit in self._display]
+
+    def match_article(self, article):
+        """Match keywords against an article's title and body fields"""
+        parts = [article.get(field) for field in ('title', 'description', 'summary', 'content', 'body')]
+        return self.match('\n'.join(str(part) for part in parts if part))
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class SeenStore:
+    """Durable set of already-notified article links
+
+    Links are stored in a local SQLite database in WAL mode, with an in-memory
+    Bloom filter in front of it so that most lookups of new links never touch
+    disk. Entries expire after `ttl` seconds. With `shared=True` (several
+    processes writing the same database) the Bloom filter only knows this
+    process's writes, so every lookup reads the database.
+    """
+
+    PURGE_INTERVAL = 3600
+    SQL_CHUNK = 500
+
+    def __init__(self, path=BOT_STATE_DB, ttl=SEEN_ARTICLES_TTL,
+                 capacity=SEEN_BLOOM_CAPACITY, error_rate=SEEN_BLOOM_ERROR_RATE, shared=False):
+        import sqlite3
+
+        self.ttl = ttl
+        self.shared = shared
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_articles (link TEXT PRIMARY KEY, seen_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_articles_seen_at ON seen_articles (seen_at)")
+        self._last_purge = 0.0
+        self.purge()
+
+    def _rebuild_bloom(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM seen_articles").fetchone()[0]
+        # Room for as many new links again, so growth triggers a rebuild only when the size doubles
+        self._bloom_capacity = max(self.capacity, count * 2)
+        self._bloom = BloomFilter(self._bloom_capacity, self.error_rate)
+        self._bloom_count = count
+        for (link,) in self._conn.execute("SELECT link FROM seen_articles"):
+            self._bloom.add(link)
+
+    def purge(self):
+        """Drop expired entries and rebuild the Bloom filter without them"""
+        with self._lock:
+            self._conn.execute("DELETE FROM seen_articles WHERE seen_at < ?", (time.time() - self.ttl,))
+            self._rebuild_bloom()
+            self._last_purge = time.monotonic()
+
+    def _maybe_purge(self):
+        if time.monotonic() - self._last_purge > self.PURGE_INTERVAL or self._bloom_count > self._bloom_capacity:
+            self.purge()
+
+    def contains(self, link):
+        """Return True if `link` was already notified and has not expired"""
+        if not link:
+            return False
+        with self._lock:
+            if not self.shared and link not in self._bloom:
+                return False
+            row = self._conn.execute(
+                "SELECT 1 FROM seen_articles WHERE link = ? AND seen_at >= ?",
+                (link, time.time() - self.ttl)
+            ).fetchone()
+        return row is not None
+
+    def filter_unseen(self, links):
+        """Bulk check: return the subset of `links` that were not notified yet, in order"""
+        links = [link for link in dict.fromkeys(links) if link]
+        with self._lock:
+            candidates = links if self.shared else [link for link in links if link in self._bloom]
+            seen = set()
+            cutoff = time.time() - self.ttl
+            for i in range(0, len(candidates), self.SQL_CHUNK):
+                chunk = candidates[i:i + self.SQL_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                seen.update(row[0] for row in self._conn.execute(
+                    f"SELECT link FROM seen_articles WHERE link IN ({placeholders}) AND seen_at >= ?",
+                    (*chunk, cutoff)
+                ))
+        return [link for link in links if link not in seen]
+
+    def add(self, link):
+        self.add_many([link])
+
+    def add_many(self, links):
+        """Record links as notified"""
+        links = [link for link in links if link]
+        if not links:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen_articles (link, seen_at) VALUES (?, ?)",
+                [(link, now) for link in links]
+            )
+            for link in links:
+                self._bloom.add(link)
+            self._bloom_count += len(links)
+        self._maybe_purge()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SubscriptionStore:
+    """Per-chat keyword subscriptions with an inverted keyword -> chats index
+
+    Subscriptions are stored in the local SQLite database and mirrored in
+    memory. Keywords are keyed by their KeywordMatcher-normalized form, so
+    `recipients` finds every chat interested in a set of matched keywords
+    with one index lookup per keyword.
+    """
+
+    def __init__(self, path=BOT_STATE_DB, limit=SUBSCRIPTION_KEYWORDS_LIMIT):
+        import sqlite3
+
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS subscriptions ("
+            "chat_id TEXT NOT NULL, keyword TEXT NOT NULL, display TEXT NOT NULL, "
+            "PRIMARY KEY (chat_id, keyword))"
+        )
+        self._by_chat = {}
+        self._by_keyword = {}
+        for chat_id, keyword, display in self._conn.execute("SELECT chat_id, keyword, display FROM subscriptions"):
+            self._index(chat_id, keyword, display)
+
+    def _index(self, chat_id, keyword, display):
+        self._by_chat.setdefault(chat_id, {})[keyword] = display
+        self._by_keyword.setdefault(keyword, {})[chat_id] = display
+
+    def _unindex(self, chat_id, keyword):
+        self._by_chat.get(chat_id, {}).pop(keyword, None)
+        if not self._by_chat.get(chat_id, True):
+            del self._by_chat[chat_id]
+        chats = self._by_keyword.get(keyword)
+        if chats is not None:
+            chats.pop(chat_id, None)
+            if not chats:
+                del self._by_keyword[keyword]
+
+    def subscribe(self, chat_id, words):
+        """Subscribe a chat to words; returns (added, existing, over_limit) word lists"""
+        chat_id = str(chat_id)
+        added, existing, over_limit = [], [], []
+        with self._lock:
+            current = self._by_chat.get(chat_id, {})
+            rows = []
+            for word in words:
+                keyword = KeywordMatcher.normalize(word).strip()
+                if not keyword:
+                    continue
+                if keyword in current or any(row[1] == keyword for row in rows):
+                    existing.append(word)
+                elif len(current) + len(rows) >= self.limit:
+                    over_limit.append(word)
+                else:
+                    rows.append((chat_id, keyword, word.strip()))
+                    added.append(word)
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO subscriptions (chat_id, keyword, display) VALUES (?, ?, ?)", rows
+                )
+                for row in rows:
+                    self._index(*row)
+        return added, existing, over_limit
+
+    def unsubscribe(self, chat_id, words=None):
+        """Drop a chat's subscriptions to words (all of them if words is None); returns the removed words"""
+        chat_id = str(chat_id)
+        with self._lock:
+            current = self._by_chat.get(chat_id, {})
+            if words is None:
+                keywords = list(current)
+            else:
+                keywords = [k for k in (KeywordMatcher.normalize(word).strip() for word in words) if k in current]
+            removed = [current[keyword] for keyword in keywords]
+            if keywords:
+                self._conn.executemany(
+                    "DELETE FROM subscriptions WHERE chat_id = ? AND keyword = ?",
+                    [(chat_id, keyword) for keyword in keywords]
+                )
+                for keyword in keywords:
+                    self._unindex(chat_id, keyword)
+        return removed
+
+    def keywords(self, chat_id):
+        """Return the words a chat is subscribed to"""
+        return list(self._by_chat.get(str(chat_id), {}).values())
+
+    def all_keywords(self):
+        """Return one display form of every subscribed keyword"""
+        with self._lock:
+            return [next(iter(chats.values())) for chats in self._by_keyword.values()]
+
+    def has_keyword(self, word):
+        return KeywordMatcher.normalize(word).strip() in self._by_keyword
+
+    def recipients(self, matched):
+        """Map each chat subscribed to any of the matched keywords to the keywords it is subscribed to"""
+        result = {}
+        with self._lock:
+            for word in matched:
+                for chat_id, display in self._by_keyword.get(KeywordMatcher.normalize(word).strip(), {}).items():
+                    result.setdefault(chat_id, []).append(display)
+        return result
+
+    def stats(self):
+        return {'chats': len(self._by_chat), 'keywords': len(self._by_keyword)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Outbox:
+    """Durable bot state (pause flag, feed cursor) and backlog of notifications suppressed while paused
+
+    Both live in the local SQLite database. Suppressed notifications are only
+    ever appended; `delete_through` drops a chat's rows once its backlog has
+    been delivered. Only the article fields needed for a digest are kept.
+    """
+
+    def __init__(self, path=BOT_STATE_DB):
+        import sqlite3
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS bot_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT NOT NULL, "
+            "article TEXT NOT NULL, keywords TEXT, created_at REAL NOT NULL)"
+        )
+        self._paused = self.get_state('notifications_paused') == '1'
+        self._paused_checked_at = time.monotonic()
+
+    def get_state(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM bot_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_state(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO bot_state (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def paused(self):
+        # Re-read at most once a second; worker processes share the flag
+        if time.monotonic() - self._paused_checked_at > 1:
+            self._paused = self.get_state('notifications_paused') == '1'
+            self._paused_checked_at = time.monotonic()
+        return self._paused
+
+    def set_paused(self, paused):
+        self.set_state('notifications_paused', '1' if paused else '0')
+        self._paused = bool(paused)
+        self._paused_checked_at = time.monotonic()
+
+    def append(self, chat_id, article, keywords=None):
+        article = {field: article.get(field) for field in OUTBOX_ARTICLE_FIELDS if article.get(field) is not None}
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outbox (chat_id, article, keywords, created_at) VALUES (?, ?, ?, ?)",
+                (str(chat_id), json.dumps(article, ensure_ascii=False),
+                 json.dumps(list(keywords)) if keywords else None, time.time())
+            )
+
+    def pending(self):
+        """Return {chat_id: [(row id, article, keywords), ...]} in arrival order"""
+        result = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT id, chat_id, article, keywords FROM outbox ORDER BY id").fetchall()
+        for row_id, chat_id, article, keywords in rows:
+            result.setdefault(chat_id, []).append(
+                (row_id, json.loads(article), json.loads(keywords) if keywords else None)
+            )
+        return result
+
+    def delete_through(self, chat_id, row_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE chat_id = ? AND id <= ?", (str(chat_id), row_id))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobQueue:
+    """Notification job queue shared by worker processes through the local SQLite database
+
+    Each job is one (chat, article) notification. `dedup_key` is unique, so
+    an article is queued for a chat at most once, and finished jobs are
+    kept for `ttl` seconds to keep it that way. `claim` leases every
+    pending job of up to `max_chats` chats that no other worker holds, so
+    a chat's notifications stay in order and are sent by one worker at a time.
+    Jobs whose lease expires (e.g. the worker crashed) are claimed again.
+    A chat with a job waiting for a retry is not claimed until then, and a
+    job that keeps failing ends up with status 'failed'.
+    """
+
+    PURGE_INTERVAL = 3600
+
+    def __init__(self, path=BOT_STATE_DB, lease=JOB_LEASE_SECONDS, ttl=SEEN_ARTICLES_TTL):
+        import sqlite3
+
+        self.lease = lease
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS notification_jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT NOT NULL, dedup_key TEXT UNIQUE, "
+            "article TEXT NOT NULL, keywords TEXT, status TEXT NOT NULL DEFAULT 'pending', "
+            "owner TEXT, lease_until REAL NOT NULL DEFAULT 0, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS notification_jobs_pending ON notification_jobs (status, chat_id, id)"
+        )
+        self._last_purge = 0.0
+
+    def put(self, chat_id, article, keywords=None, dedup_key=None):
+        """Queue a notification; returns False if the same dedup_key was already queued"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO notification_jobs (chat_id, dedup_key, article, keywords, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(chat_id), dedup_key, json.dumps(article, ensure_ascii=False),
+                 json.dumps(list(keywords)) if keywords else None, time.time())
+            )
+        return cursor.rowcount > 0
+
+    def claim(self, owner, max_chats=JOB_CLAIM_CHATS):
+        """Lease the pending jobs of up to max_chats free chats; returns {chat_id: [(id, article, keywords)]}"""
+        now = time.time()
+        claimed = {}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Chats with a leased job or one waiting for a retry are skipped
+                chats = [row[0] for row in self._conn.execute(
+                    "SELECT chat_id FROM notification_jobs WHERE status = 'pending' AND lease_until <= ? "
+                    "AND chat_id NOT IN (SELECT chat_id FROM notification_jobs "
+                    "WHERE status = 'pending' AND lease_until > ?) "
+                    "GROUP BY chat_id ORDER BY MIN(id) LIMIT ?",
+                    (now, now, max_chats)
+                )]
+                for chat_id in chats:
+                    self._conn.execute(
+                        "UPDATE notification_jobs SET owner = ?, lease_until = ?, attempts = attempts + 1 "
+                        "WHERE status = 'pending' AND chat_id = ? AND lease_until <= ?",
+                        (owner, now + self.lease, chat_id, now)
+                    )
+                    claimed[chat_id] = [
+                        (job_id, json.loads(article), json.loads(keywords) if keywords else None)
+                        for job_id, article, keywords in self._conn.execute(
+                            "SELECT id, article, keywords FROM notification_jobs "
+                            "WHERE status = 'pending' AND chat_id = ? AND owner = ? ORDER BY id",
+                            (chat_id, owner)
+                        )
+                    ]
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._maybe_purge()
+        return claimed
+
+    def renew(self, owner):
+        """Extend the leases held by owner"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE notification_jobs SET lease_until = ? WHERE status = 'pending' AND owner = ?",
+                (time.time() + self.lease, owner)
+            )
+
+    def complete(self, owner, job_ids):
+        """Mark leased jobs as done; returns how many were still held by owner"""
+        job_ids = list(job_ids)
+        done = 0
+        with self._lock:
+            for start in range(0, len(job_ids), SeenStore.SQL_CHUNK):
+                chunk = job_ids[start:start + SeenStore.SQL_CHUNK]
+                done += self._conn.execute(
+                    "UPDATE notification_jobs SET status = 'done', owner = NULL "
+                    f"WHERE owner = ? AND id IN ({','.join('?' * len(chunk))})",
+                    [owner, *chunk]
+                ).rowcount
+        return done
+
+    def release(self, owner):
+        """Give up every lease held by owner (e.g. on shutdown)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE notification_jobs SET owner = NULL, lease_until = 0 WHERE status = 'pending' AND owner = ?",
+                (owner,)
+            )
+
+    def retry_later(self, owner, job_ids, delay=JOB_RETRY_DELAY, max_attempts=JOB_MAX_ATTEMPTS):
+        """Release failed jobs to be claimed again after `delay` seconds
+
+        Jobs already tried `max_attempts` times are marked 'failed' instead;
+        returns their ids.
+        """
+        job_ids = list(job_ids)
+        given_up = []
+        with self._lock:
+            for start in range(0, len(job_ids), SeenStore.SQL_CHUNK):
+                chunk = job_ids[start:start + SeenStore.SQL_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                given_up.extend(row[0] for row in self._conn.execute(
+                    "UPDATE notification_jobs SET status = 'failed', owner = NULL "
+                    f"WHERE status = 'pending' AND owner = ? AND attempts >= ? AND id IN ({placeholders}) "
+                    "RETURNING id",
+                    [owner, max_attempts, *chunk]
+                ))
+                # Still owned by nobody, but the lease keeps the chat from being claimed before then
+                self._conn.execute(
+                    "UPDATE notification_jobs SET owner = NULL, lease_until = ? "
+                    f"WHERE status = 'pending' AND owner = ? AND id IN ({placeholders})",
+                    [time.time() + delay, owner, *chunk]
+                )
+        return given_up
+
+    def pending(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM notification_jobs WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def _maybe_purge(self):
+        if time.monotonic() - self._last_purge < self.PURGE_INTERVAL:
+            return
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM notification_jobs WHERE status IN ('done', 'failed') AND created_at < ?",
+                (time.time() - self.ttl,)
+            )
+            self._last_purge = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class KeywordCache:
+    """In-process keyword list cache with TTL and stale-while-revalidate refresh
+
+    `fetch` is a coroutine returning the keyword list, or None if the API
+    request failed. Writes made through `add`/`remove` update the cached list
+    directly, so it does not have to be re-fetched after every change.
+    `on_refresh` is called with the new list after every successful fetch.
+    """
+
+    def __init__(self, fetch, ttl=KEYWORDS_CACHE_TTL, stale_ttl=KEYWORDS_CACHE_STALE_TTL, on_refresh=None):
+        self._fetch = fetch
+        self._on_refresh = on_refresh
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._keywords = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self._refresh_task = None
+
+    async def get(self):
+        """Return the keyword list, refreshing it if it is missing or expired"""
+        age = time.monotonic() - self._loaded_at
+        if self._keywords is not None and age < self.ttl:
+            return list(self._keywords)
+        if self._keywords is not None and age < self.ttl + self.stale_ttl:
+            # Serve the stale list now and revalidate in the background
+            self._start_refresh()
+            return list(self._keywords)
+        await asyncio.shield(self._start_refresh())
+        return list(self._keywords or [])
+
+    def _start_refresh(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self):
+        version = self._version
+        keywords = await self._fetch()
+        if keywords is None:
+            return
+        if version != self._version:
+            # A write landed while fetching; keep the written state and revalidate later
+            return
+        self._keywords = list(keywords)
+        self._loaded_at = time.monotonic()
+        if self._on_refresh is not None:
+            self._on_refresh(self._keywords)
+
+    def invalidate(self):
+        """Force the next `get` to revalidate"""
+        self._loaded_at = 0.0
+        self._version += 1
+
+    def add(self, keyword):
+        """Write-through: add a keyword to the cached list"""
+        if self._keywords is None:
+            return
+        word = _keyword_word(keyword).casefold()
+        if not any(_keyword_word(k).casefold() == word for k in self._keywords):
+            self._keywords.append(keyword)
+        self._version += 1
+
+    def remove(self, keyword_text):
+        """Write-through: remove a keyword from the cached list, returning how many entries were dropped"""
+        if self._keywords is None:
+            return 0
+        word = keyword_text.casefold()
+        before = len(self._keywords)
+        self._keywords = [k for k in self._keywords if _keyword_word(k).casefold() != word]
+        self._version += 1
+        return before - len(self._keywords)
+
+class SourceRegistry:
+    """Domain to source-name registry with subdomain-aware lookup
+
+    Domains are stored in a trie of reversed host labels, so `m.news.am` and
+    `en.armenpress.am` resolve to the name of the longest registered suffix.
+    URL lookups are memoized in a bounded LRU. Mappings from `path` (a JSON
+    object of "domain": "name") extend the defaults and are reloaded when the
+    file changes.
+    """
+
+    _NAME = object()
+
+    def __init__(self, names=SOURCE_NAMES, path=SOURCE_NAMES_FILE,
+                 reload_interval=SOURCE_NAMES_RELOAD_INTERVAL, cache_size=SOURCE_NAME_CACHE_SIZE):
+        self.defaults = dict(names)
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = None
+        self._trie = self._build(self.defaults)
+        self._cached_name = functools.lru_cache(maxsize=cache_size)(self._resolve_url)
+
+    @classmethod
+    def _build(cls, names):
+        trie = {}
+        for domain, name in names.items():
+            node = trie
+            for label in reversed(cls._host(domain).split('.')):
+                node = node.setdefault(label, {})
+            node[cls._NAME] = name
+        return trie
+
+    @staticmethod
+    def _host(host):
+        host = host.strip().lower().rstrip('.')
+        return host[4:] if host.startswith('www.') else host
+
+    def lookup(self, host):
+        """Return the name of the longest registered suffix of `host`, or None"""
+        node, name = self._trie, None
+        for label in reversed(self._host(host).split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            name = node.get(self._NAME, name)
+        return name
+
+    def _resolve_url(self, url):
+        try:
+            host = urlparse(url).hostname
+        except ValueError:
+            host = None
+        if not host:
+            return url
+        host = self._host(host)
+        return self.lookup(host) or host.title()
+
+    def name_for_url(self, url):
+        """Return a readable source name for an article or source URL"""
+        self._maybe_reload()
+        try:
+            return self._cached_name(url)
+        except TypeError:
+            # Unhashable or otherwise unusable input
+            return url
+
+    def _maybe_reload(self, force=False):
+        if not self.path:
+            return
+        # The data file is first read on first use (or by the startup pre-warm)
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                mtime = None
+            if mtime == self._mtime:
+                return
+            self.reload(mtime)
+
+    def reload(self, mtime=None):
+        """Rebuild the registry from the defaults plus the data file"""
+        names = dict(self.defaults)
+        if mtime is not None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    extra = json.load(f)
+                if not isinstance(extra, dict):
+                    raise ValueError("expected a JSON object")
+                names.update({str(domain): str(name) for domain, name in extra.items()})
+            except (OSError, ValueError) as e:
+                # Keep serving the previous mappings until the file is fixed
+                logger.error(f"❌ Failed to load source names from {self.path}: {e}")
+                return
+            logger.info(f"✅ Loaded {len(extra)} source names from {self.path}")
+        self._trie = self._build(names)
+        self._mtime = mtime
+        self._cached_name.cache_clear()
+
+
+SOURCE_REGISTRY = SourceRegistry()
+
+
+class CommandContext:
+    """Minimal stand-in for telegram.ext.CallbackContext used outside the dispatcher"""
+
+    def __init__(self, bot, args=None):
+        self.bot = bot
+        self.args = args or []
+
+
 class TelegramNotifier:
     def __init__(self):
         # Get bot token and chat ID from environment variables
@@ -42,109 +1700,1037 @@ class TelegramNotifier:
         logger.info(f"✅ Bot Token loaded. Partial: {self.bot_token[:4]}...{self.bot_token[-4:]}")
         logger.info(f"✅ Chat ID loaded: {self.chat_id}")
             
-        self.bot = Bot(token=self.bot_token)
+        from telegram.utils.request import Request
+        self.bot = Bot(token=self.bot_token, base_url=self._bot_base_url(),
+                       request=Request(con_pool_size=TELEGRAM_POOL_SIZE))
         
-        # Notification settings (stored in memory for now)
-        self.notifications_paused = False
+        # Pause state and the backlog of suppressed notifications (opened on first use)
+        self._outbox = None
+        self._outbox_lock = threading.Lock()
+        self._outbox_flush_task = None
+
+        # Django API connection pool settings
+        self.api_timeout = API_TIMEOUT
+        self.api_connect_timeout = API_CONNECT_TIMEOUT
+        self.api_pool_size = API_POOL_SIZE
+        self.api_pool_per_host = API_POOL_PER_HOST
+        self.api_dns_cache_ttl = API_DNS_CACHE_TTL
+        self.api_keepalive_timeout = API_KEEPALIVE_TIMEOUT
+
+        # aiohttp sessions are bound to the event loop that created them,
+        # so the pooled session is kept per loop
+        self._sessions = {}
+
+        # Long-lived background event loop shared by all sync callers
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+
+        # Rate-limited outbound notification queue (created on first use)
+        self._notification_queue = None
+
+        # Webhook mode settings
+        self.webhook_secret = TELEGRAM_WEBHOOK_SECRET
+        self._bot_username = None
+
+        # Command executor (created on first use)
+        self._command_executor = None
+
+        # Retry policy and circuit breakers for the Django API and the Telegram API
+        self.retry_policy = RetryPolicy()
+        self.breakers = {
+            'django_api': CircuitBreaker('django_api'),
+            'telegram': CircuitBreaker('telegram'),
+        }
+
+        # Durable record of already-notified links (opened on first use)
+        self._seen_store = None
+        self._seen_store_lock = threading.Lock()
+
+        # Per-chat keyword subscriptions (opened on first use)
+        self._subscriptions = None
+        self._subscriptions_lock = threading.Lock()
+
+        # In-process keyword list cache and the local matcher built from it.
+        # The matcher also holds every subscribed keyword; _global_keywords
+        # (normalized, None until first loaded) are the API keywords, which
+        # notify the default chat.
+        self.keyword_matcher = KeywordMatcher()
+        self._global_keywords = None
+        self.keyword_cache = KeywordCache(self._fetch_keywords, on_refresh=self._sync_keyword_matcher)
+
+        # /keywords pages as {page: (monotonic timestamp, keywords, total)}; whether the
+        # API paginates is learned from the first response
+        self._keyword_pages = {}
+        self._keywords_paginated = None
+        # Whether the API has the bulk keyword endpoints (learned on first use)
+        self._keywords_bulk_api = None
+
+        # Last computed stats as (monotonic timestamp, stats), the in-flight stats
+        # fetch shared by concurrent callers, and whether /api/stats/ exists
+        self._stats_cache = None
+        self._stats_task = None
+        self._stats_endpoint = None
+
+        # Worker mode: notifications go to the shared job queue (opened on first use)
+        self.notification_workers = NOTIFICATION_WORKERS
+        self._job_queue = None
+        self._job_queue_lock = threading.Lock()
+
+        # Article feed consumer task (see consume_articles)
+        self._feed_task = None
+        # {article id: failed polls} of feed articles whose notification failed
+        self._feed_retries = {}
+
+        # Conditional GET cache: {url: (etag, last_modified, monotonic timestamp, parsed value)}
+        self._http_cache = {}
+
+        # Set once startup (pre-warm included) is done and commands are accepted
+        self.ready = threading.Event()
+        self._metrics_runner = None
+
+    def _ensure_loop(self):
+        """Start the background event loop thread on first use"""
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._loop_thread = threading.Thread(target=run_loop, name="telegram-bot-loop", daemon=True)
+                self._loop_thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro):
+        """Schedule a coroutine on the background loop and return a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run_sync(self, coro, timeout=None):
+        """Run a coroutine on the background loop and block until it finishes"""
+        return self.submit(coro).result(timeout)
+
+    def shutdown(self, timeout=10):
+        """Close pooled connections and stop the background event loop"""
+        self.ready.clear()
+        if self._feed_task is not None:
+            self._feed_task.cancel()
+            self._feed_task = None
+        if BOT_READY_FILE:
+            try:
+                os.remove(BOT_READY_FILE)
+            except OSError:
+                pass
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = None
+            self._loop_thread = None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout)
+        except Exception as e:
+            logger.error(f"❌ Failed to close HTTP session on shutdown: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+        if self._seen_store is not None:
+            self._seen_store.close()
+            self._seen_store = None
+        if self._subscriptions is not None:
+            self._subscriptions.close()
+            self._subscriptions = None
+        if self._outbox is not None:
+            self._outbox.close()
+            self._outbox = None
+        if self._job_queue is not None:
+            self._job_queue.close()
+            self._job_queue = None
+
+    async def _send_message(self, **kwargs):
+        """Send a Telegram message without blocking the event loop, with retries and a circuit breaker"""
+        return await self._telegram_call('send_message', **kwargs)
+
+    async def _telegram_call(self, method, **kwargs):
+        """Call a Bot API method (e.g. "send_message") through the retry policy and circuit breaker
+
+        Latency and error metrics are recorded for send_message only, and
+        send_message is not retried after a timeout (see _is_retryable_telegram_send_error).
+        """
+        bot_method = getattr(self.bot, method)
+        observed = method == 'send_message'
+
+        async def attempt():
+            started = time.perf_counter()
+            try:
+                if asyncio.iscoroutinefunction(bot_method):
+                    return await bot_method(**kwargs)
+                # python-telegram-bot v13 Bot is synchronous, run it in the default executor
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, functools.partial(bot_method, **kwargs))
+            except RetryAfter:
+                if observed:
+                    SEND_ERRORS.inc(kind='retry_after')
+                raise
+            except (TimedOut, asyncio.TimeoutError):
+                if observed:
+                    SEND_ERRORS.inc(kind='timeout')
+                raise
+            except NetworkError:
+                if observed:
+                    SEND_ERRORS.inc(kind='network')
+                raise
+            except Exception:
+                if observed:
+                    SEND_ERRORS.inc(kind='other')
+                raise
+            finally:
+                if observed:
+                    SEND_LATENCY.observe(time.perf_counter() - started)
+
+        try:
+            return await resilient_call(
+                attempt, self.breakers['telegram'], self.retry_policy, TELEGRAM_SEND_DEADLINE,
+                _is_retryable_telegram_send_error if observed else _is_retryable_telegram_error
+            )
+        except CircuitOpenError:
+            if observed:
+                SEND_ERRORS.inc(kind='circuit_open')
+            raise
+
+    async def _api_call(self, method, path, handler, endpoint=None, **kwargs):
+        """Call the Django API through the retry policy and circuit breaker
+
+        `handler(response)` consumes the response; 5xx and 429 responses are
+        retried before it is called. `endpoint` is the metrics label for the
+        call and defaults to the URL path.
+        """
+        import aiohttp
+
+        session = await self._get_session()
+        url = path if path.startswith('http') else f"{API_BASE_URL}{path}"
+        endpoint = endpoint or urlparse(url).path
+
+        async def attempt():
+            started = time.perf_counter()
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status >= 400:
+                        API_ERRORS.inc(method=method, endpoint=endpoint, kind=f"status_{response.status}")
+                    if response.status >= 500 or response.status == 429:
+                        retry_after = response.headers.get('Retry-After')
+                        raise UpstreamError(
+                            f"{method} {path}: Status {response.status}", response.status,
+                            float(retry_after) if retry_after and retry_after.isdigit() else None
+                        )
+                    return await handler(response)
+            except asyncio.TimeoutError:
+                API_ERRORS.inc(method=method, endpoint=endpoint, kind='timeout')
+                raise
+            except aiohttp.ClientError:
+                API_ERRORS.inc(method=method, endpoint=endpoint, kind='client_error')
+                raise
+            finally:
+                API_LATENCY.observe(time.perf_counter() - started, method=method, endpoint=endpoint)
+
+        try:
+            return await resilient_call(
+                attempt, self.breakers['django_api'], self.retry_policy,
+                DJANGO_API_DEADLINE, _is_retryable_api_error
+            )
+        except CircuitOpenError:
+            API_ERRORS.inc(method=method, endpoint=endpoint, kind='circuit_open')
+            raise
+
+    def _collect_metrics(self):
+        """Refresh gauges that mirror the notifier's current state"""
+        NOTIFICATIONS_PAUSED.set(1 if self.notifications_paused else 0)
+        for field, value in self.queue_stats().items():
+            QUEUE_STATE.set(value, field=field)
+        for field, value in self.command_stats().items():
+            COMMAND_STATE.set(value, field=field)
+        for name, breaker in self.breakers.items():
+            BREAKER_OPEN.set(0 if breaker.state == 'closed' else 1, upstream=name)
+
+    def render_metrics(self):
+        """Return all metrics in the Prometheus text exposition format"""
+        self._collect_metrics()
+        return METRICS.render()
+
+    async def _handle_metrics_request(self, request):
+        from aiohttp import web
+        return web.Response(text=self.render_metrics(), content_type='text/plain', charset='utf-8',
+                            headers={'X-Content-Type-Options': 'nosniff'})
+
+    async def _handle_ready_request(self, request):
+        from aiohttp import web
+        if self.ready.is_set():
+            return web.Response(text='ready')
+        return web.Response(status=503, text='starting')
+
+    async def start_metrics_server(self, host=METRICS_HOST, port=METRICS_PORT):
+        """Serve /metrics and /ready on a local HTTP port and return the AppRunner"""
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_metrics_request)
+        app.router.add_get('/ready', self._handle_ready_request)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"📈 Metrics: http://{host}:{port}/metrics")
+        return runner
+
+    @staticmethod
+    def _bot_base_url():
+        return f"{TELEGRAM_API_URL}/bot" if TELEGRAM_API_URL else None
+
+    async def _get_session(self):
+        """Return the pooled keep-alive aiohttp session for the running event loop"""
+        import aiohttp
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.api_pool_size,
+                limit_per_host=self.api_pool_per_host,
+                ttl_dns_cache=self.api_dns_cache_ttl,
+                keepalive_timeout=self.api_keepalive_timeout,
+            )
+            timeout = aiohttp.ClientTimeout(total=self.api_timeout, connect=self.api_connect_timeout)
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._sessions[loop] = session
+        return session
+
+    async def close(self):
+        """Close the pooled HTTP session of the running event loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
     
+    def _get_notification_queue(self):
+        """Return the outbound notification queue, creating it on first use"""
+        if self._notification_queue is None:
+            self._notification_queue = NotificationQueue(
+                self._ensure_loop(), self._deliver_article, self._deliver_digest
+            )
+        return self._notification_queue
+
+    def _get_seen_store(self):
+        """Return the already-notified link store, opening it on first use"""
+        with self._seen_store_lock:
+            if self._seen_store is None:
+                # Worker processes record sends the other processes must see
+                self._seen_store = SeenStore(shared=NOTIFICATION_WORKERS > 0)
+            return self._seen_store
+
+    def filter_new_articles(self, articles):
+        """Bulk check: return the articles whose links have not been notified yet"""
+        unseen = set(self._get_seen_store().filter_unseen(article.get('link') for article in articles))
+        return [article for article in articles if not article.get('link') or article.get('link') in unseen]
+
+    def _get_outbox(self):
+        """Return the durable pause state / outbox, opening it on first use"""
+        with self._outbox_lock:
+            if self._outbox is None:
+                self._outbox = Outbox()
+            return self._outbox
+
+    @property
+    def notifications_paused(self):
+        return self._get_outbox().paused
+
+    @notifications_paused.setter
+    def notifications_paused(self, paused):
+        self._get_outbox().set_paused(paused)
+
+    def _suppress(self, article, keywords=None, chat_id=None):
+        """Keep a notification in the outbox while paused (for all its recipients unless chat_id is given)"""
+        recipients = {chat_id: keywords} if chat_id is not None else self.recipients_for(keywords, article)
+        outbox = self._get_outbox()
+        for recipient, chat_keywords in recipients.items():
+            if not self._is_duplicate(article, recipient):
+                outbox.append(recipient, article, chat_keywords)
+        logger.info(f"🔇 Ծանուցումները դադարեցված են, հոդվածը պահվեց: {article.get('link')}")
+        return True
+
+    def _get_job_queue(self):
+        """Return the job queue shared with the worker processes, opening it on first use"""
+        with self._job_queue_lock:
+            if self._job_queue is None:
+                self._job_queue = JobQueue()
+            return self._job_queue
+
+    def _put_job(self, chat_id, article, keywords=None):
+        """Hand a notification to the worker processes; returns False if it is already queued"""
+        job = {field: article.get(field) for field in JOB_ARTICLE_FIELDS if article.get(field) is not None}
+        if 'created_at' in job and not isinstance(job['created_at'], str):
+            job['created_at'] = job['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+        return self._get_job_queue().put(chat_id, job, keywords,
+                                         dedup_key=self._seen_key(chat_id, article.get('link')) or None)
+
+    def _get_subscriptions(self):
+        """Return the per-chat subscription store, opening it on first use"""
+        with self._subscriptions_lock:
+            if self._subscriptions is None:
+                self._subscriptions = SubscriptionStore()
+                for word in self._subscriptions.all_keywords():
+                    self.keyword_matcher.add(word)
+            return self._subscriptions
+
+    def _seen_key(self, chat_id, link):
+        """Seen-store key of a link for one chat; the default chat uses the bare link"""
+        if not link or chat_id is None or str(chat_id) == str(self.chat_id):
+            return link
+        return f"{chat_id} {link}"
+
+    def _is_duplicate(self, article, chat_id=None):
+        if self._get_seen_store().contains(self._seen_key(chat_id, article.get('link'))):
+            logger.info(f"🔁 Հոդվածն արդեն ուղարկվել է: {article.get('link')}")
+            return True
+        return False
+
+    def recipients_for(self, keywords=None, article=None):
+        """Map every chat that should get an article with these keywords to the keywords shown to it
+
+        Subscribers come from the inverted keyword index. The default chat
+        gets the article for API keywords, for keywords nobody subscribed to
+        (e.g. matched by the caller), when no keywords are given and while
+        the API keywords are not loaded yet. With `article`, it is also
+        matched locally, so chats subscribed to keywords the caller does not
+        know about get it too.
+        """
+        subscriptions = self._get_subscriptions()
+        if not keywords:
+            recipients = {str(self.chat_id): keywords}
+        else:
+            recipients = subscriptions.recipients(keywords)
+            global_keywords = self._global_keywords
+            if global_keywords is None or any(
+                    KeywordMatcher.normalize(keyword).strip() in global_keywords or not subscriptions.has_keyword(keyword)
+                    for keyword in keywords):
+                recipients[str(self.chat_id)] = keywords
+        if article is not None:
+            known = {KeywordMatcher.normalize(keyword).strip() for keyword in keywords or ()}
+            matched = [keyword for keyword in self.keyword_matcher.match_article(article)
+                       if KeywordMatcher.normalize(keyword).strip() not in known]
+            for chat_id, words in subscriptions.recipients(matched).items():
+                chat_keywords = list(recipients.get(chat_id) or [])
+                recipients[chat_id] = chat_keywords + [word for word in words if word not in chat_keywords]
+        return recipients
+
+    def enqueue(self, article, keywords=None, on_done=None):
+        """Queue an article notification for every interested chat without blocking
+
+        Returns False if it was not accepted for any chat. While paused the
+        notification goes to the outbox instead. `on_done(ok)` is called for
+        every chat it was queued (or dropped) for; jobs handed to the worker
+        processes are retried there and do not report back.
+        """
+        if self.notifications_paused:
+            return self._suppress(article, keywords)
+        accepted = False
+        for chat_id, chat_keywords in self.recipients_for(keywords, article).items():
+            if self._is_duplicate(article, chat_id):
+                continue
+            if self.notification_workers:
+                # Delivered by the worker processes; the job queue drops duplicates
+                accepted = self._put_job(chat_id, article, chat_keywords) or accepted
+            elif self._get_notification_queue().enqueue(chat_id, article, chat_keywords, on_done):
+                accepted = True
+            else:
+                logger.warning(f"⚠️ Ծանուցումների հերթը լիքն է, հոդվածը բաց է թողնվել: {article.get('link')}")
+                if on_done is not None:
+                    on_done(False)
+        return accepted
+
+    def queue_stats(self):
+        """Return outbound queue depth, drop counters and the outbox backlog"""
+        if self._notification_queue is None:
+            stats = {'depth': 0, 'enqueued': 0, 'sent': 0, 'digests': 0, 'dropped': 0, 'failed': 0, 'active_chats': 0}
+        else:
+            stats = self._notification_queue.stats()
+        stats['outbox'] = len(self._outbox) if self._outbox is not None else 0
+        if self.notification_workers:
+            stats['jobs_pending'] = self._get_job_queue().pending()
+        return stats
+
     async def send_article_notification(self, article, keywords=None):
         """Send a notification about a new article to Telegram"""
-        # Check if notifications are paused
+        # While paused, keep it for the digest sent on /resume
+        if self.notifications_paused:
+            self._suppress(article, keywords)
+            return
+        if self.notification_workers:
+            self.enqueue(article, keywords)
+            return
+            
+        queue = self._get_notification_queue()
+
+        async def deliver(chat_id, chat_keywords):
+            # Skip already-notified articles before any network call
+            if self._is_duplicate(article, chat_id):
+                return
+            try:
+                await queue.acquire(chat_id)
+                await self._deliver_article(chat_id, article, chat_keywords)
+            except Exception as e:
+                logger.error(f"❌ Telegram ծանուցման սխալ ({chat_id}): {e}")
+
+        await asyncio.gather(*(deliver(chat_id, chat_keywords)
+                               for chat_id, chat_keywords in self.recipients_for(keywords, article).items()))
+
+    def _format_article_message(self, article, keywords=None):
+        """Format a single article notification (plain text to avoid formatting issues)"""
+        # Extract source name from URL
+        source_name = self._extract_source_name(article.get('source_url') or article.get('link'))
+
+        message = f"📰 Նոր հոդված\n\n"
+        message += f"🌐 Կայք: {source_name}\n"
+        message += f"📰 Վերնագիր: {article.get('title')}\n"
+        message += f"🔗 Հղում: {article.get('link')}\n"
+
+        if keywords and len(keywords) > 0:
+            keywords_text = ', '.join(keywords)
+            message += f"🔑 Բանալի բառեր ({len(keywords)}): {keywords_text}\n"
+
+        # Handle created_at field - could be string or datetime
+        created_at = article.get('created_at')
+        if created_at:
+            if isinstance(created_at, str):
+                time_str = created_at
+            else:
+                time_str = created_at.strftime('%Y-%m-%d %H:%M:%S')
+            message += f"⏰ Ժամանակ: {time_str}"
+        return message
+
+    async def _deliver_article(self, chat_id, article, keywords=None):
+        """Send one article notification, raising on failure"""
+        if self.notifications_paused:
+            # Paused after it was queued
+            self._suppress(article, keywords, chat_id)
+            return
+
+        if self._is_duplicate(article, chat_id):
+            return
+
+        if keywords and len(keywords) > 0:
+            logger.info(f"📤 Ուղարկվում է {len(keywords)} բանալի բառ: {', '.join(keywords)}")
+        else:
+            logger.info("📤 Բանալի բառեր չկան")
+
+        await self._send_message(
+            chat_id=chat_id,
+            text=self._format_article_message(article, keywords),
+            disable_web_page_preview=False
+        )
+
+        self._get_seen_store().add(self._seen_key(chat_id, article.get('link')))
+        NOTIFICATIONS_SENT.inc(mode='single')
+        logger.info(f"✅ Telegram ծանուցումը ուղարկվեց: {article.get('title', '')[:50]}...")
+
+    def _format_digest_messages(self, items, header):
+        """Pack (article, keywords) pairs into as few messages as fit Telegram's length limit"""
+        blocks = []
+        for i, (article, keywords) in enumerate(items, 1):
+            source_name = self._extract_source_name(article.get('source_url') or article.get('link'))
+            title = str(article.get('title') or '')
+            if len(title) > 150:
+                title = title[:150] + '…'
+            block = f"{i}. {source_name}: {title}\n🔗 {article.get('link')}"
+            if keywords:
+                block += f"\n🔑 {', '.join(keywords)}"
+            blocks.append(block)
+
+        messages = []
+        current = header
+        for block in blocks:
+            if len(current) + len(block) + 2 > MAX_MESSAGE_LENGTH and current != header:
+                messages.append(current)
+                current = header
+            current += "\n\n" + block
+        messages.append(current[:MAX_MESSAGE_LENGTH])
+        return messages
+
+    async def _deliver_digest(self, chat_id, items):
+        """Send several queued articles as a digest, raising on failure"""
         if self.notifications_paused:
-            logger.info("🔇 Ծանուցումները դադարեցված են")
+            # Paused after they were queued
+            for article, keywords in items:
+                self._suppress(article, keywords, chat_id)
             return
-            
+
+        keys = [self._seen_key(chat_id, article.get('link')) for article, _ in items]
+        unseen = set(self._get_seen_store().filter_unseen(keys))
+        items = [item for item, key in zip(items, keys) if not key or key in unseen]
+        if not items:
+            return
+
+        header = f"📰 Նոր հոդվածներ ({len(items)})"
+        for text in self._format_digest_messages(items, header):
+            await self._send_message(chat_id=chat_id, text=text, disable_web_page_preview=True)
+        self._get_seen_store().add_many(self._seen_key(chat_id, article.get('link')) for article, _ in items)
+        NOTIFICATIONS_SENT.inc(len(items), mode='digest')
+
+        logger.info(f"✅ Telegram ամփոփումը ուղարկվեց: {len(items)} հոդված")
+
+    @staticmethod
+    def _article_id(article):
+        article_id = article.get('id') if isinstance(article, dict) else None
+        return article_id if isinstance(article_id, int) and not isinstance(article_id, bool) else None
+
+    async def _read_feed_page(self, url, since_id, params=None):
+        """Stream one feed page, returning (articles newer than since_id, newest id seen, next page URL)
+
+        Articles are kept only if their id is above the cursor (or they have
+        no id), so a backend that ignores `since_id` is still safe to poll.
+        """
+        async def read_page(response):
+            if response.status != 200:
+                logger.warning(f"Failed to get articles feed from /api/articles/: Status {response.status}")
+                return None
+            articles, newest = [], since_id
+            parser = JSONArrayStream()
+            chunks = response.content.iter_chunked(ARTICLES_STREAM_CHUNK_SIZE)
+            final = False
+            while not final:
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    chunk, final = b'', True
+                for article in parser.feed(chunk, final):
+                    if not isinstance(article, dict):
+                        continue
+                    article_id = self._article_id(article)
+                    if article_id is None or since_id is None or article_id > since_id:
+                        if article_id is not None:
+                            newest = article_id if newest is None else max(newest, article_id)
+                        if since_id is not None:
+                            articles.append(article)
+            return articles, newest, parser.meta.get('next')
+
+        return await self._api_call('GET', url, read_page, endpoint='/api/articles/', params=params)
+
+    async def poll_articles(self):
+        """Read every article published since the persisted cursor and notify matches
+
+        The cursor (the newest article id handled) is saved once the last
+        page has been read and its notifications have left the queue, so a
+        restart re-reads at most the unfinished poll and the seen store drops
+        what was already sent. It is not moved past an article whose
+        notification failed, which is retried on the next polls (up to
+        ARTICLE_FEED_MAX_RETRIES times). Returns the number of new articles.
+        On first run the cursor starts at the newest article, without
+        notifying the backlog.
+        """
+        outbox = self._get_outbox()
+        cursor = outbox.get_state('article_feed_cursor')
+        if cursor is None:
+            # First run: only establish the cursor
+            latest = await self._newest_article_id()
+            if latest is not None:
+                outbox.set_state('article_feed_cursor', latest)
+                logger.info(f"📰 Article feed starts after article {latest}")
+            return 0
+        since_id = int(cursor)
+        params = {'since_id': since_id, 'ordering': 'id', 'page_size': ARTICLE_FEED_PAGE_SIZE}
+        url, count, latest = '/api/articles/', 0, None
+        failed = set()
+
+        def record(article_id, ok):
+            if not ok and article_id is not None:
+                failed.add(article_id)
+
+        while url:
+            page = await self._read_feed_page(url, since_id, params)
+            if page is None:
+                # Incomplete poll: keep the cursor, the next poll reads it all again
+                return count
+            articles, newest, url = page
+            # "next" links already carry the query string
+            params = None
+            if newest is not None:
+                latest = newest if latest is None else max(latest, newest)
+
+            articles.sort(key=lambda article: self._article_id(article) or 0)
+            FEED_ARTICLES.inc(len(articles))
+            count += len(articles)
+            for article in articles:
+                await self.notify_if_matched(article, functools.partial(record, self._article_id(article)))
+
+        if not self.notification_workers:
+            # Jobs for the worker processes are already durable
+            await self._get_notification_queue().join()
+
+        retries = {}
+        for article_id in failed:
+            retries[article_id] = self._feed_retries.get(article_id, 0) + 1
+            if retries[article_id] >= ARTICLE_FEED_MAX_RETRIES:
+                logger.error(f"❌ Article {article_id} notification failed {retries[article_id]} times, skipping it")
+                del retries[article_id]
+        self._feed_retries = retries
+        if retries:
+            latest = min(retries) - 1
+        if latest is not None and latest != since_id:
+            outbox.set_state('article_feed_cursor', latest)
+        return count
+
+    async def _newest_article_id(self):
+        """Return the newest article id (0 for an empty archive), or None if it could not be read
+
+        Asks for the two newest articles only. If the backend ignores
+        `ordering` (the ids do not come newest first), every page of the
+        archive is read instead.
+        """
+        page = await self._read_feed_page('/api/articles/', -1, {'ordering': '-id', 'page_size': 2})
+        if page is None:
+            return None
+        articles, newest, url = page
+        ids = [article_id for article_id in map(self._article_id, articles) if article_id is not None]
+        if url is None or (len(ids) >= 2 and ids == sorted(ids, reverse=True)):
+            return max(newest, 0)
+
+        url, params, latest = '/api/articles/', {'ordering': 'id', 'page_size': ARTICLE_FEED_PAGE_SIZE}, 0
+        while url:
+            page = await self._read_feed_page(url, None, params)
+            if page is None:
+                return None
+            _, newest, url = page
+            # "next" links already carry the query string
+            params = None
+            if newest is not None:
+                latest = max(latest, newest)
+        return latest
+
+    async def consume_articles(self):
+        """Poll the article feed forever with an adaptive interval"""
+        interval = ARTICLE_FEED_MIN_INTERVAL
+        while True:
+            try:
+                count = await self.poll_articles()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Article feed error: {e}")
+                count = 0
+            if count:
+                interval = ARTICLE_FEED_MIN_INTERVAL
+            else:
+                interval = min(ARTICLE_FEED_MAX_INTERVAL, interval * 2)
+            await asyncio.sleep(interval)
+
+    def _start_article_feed(self):
+        if ARTICLE_FEED_ENABLED and self._feed_task is None:
+            logger.info("📰 Article feed consumer started")
+            self._feed_task = self.submit(self.consume_articles())
+            self._feed_task.add_done_callback(self._log_future_error)
+
+    async def run_notification_worker(self, worker_id, workers=NOTIFICATION_WORKERS, stop=None):
+        """Deliver jobs from the shared job queue until `stop` (a threading.Event) is set
+
+        Claimed jobs go through this process's notification queue, so digests
+        and per-chat limits apply as usual; the global send rate is split
+        between the workers. Jobs are marked done once the queue has sent
+        them, and leases are renewed while that takes. Jobs whose send failed
+        are retried after JOB_RETRY_DELAY seconds, up to JOB_MAX_ATTEMPTS tries.
+        """
+        loop = asyncio.get_running_loop()
+        job_queue = self._get_job_queue()
+        owner = f"worker-{worker_id}-{os.getpid()}"
+        workers = max(1, workers)
+        queue = self._notification_queue = NotificationQueue(
+            loop, self._deliver_article, self._deliver_digest,
+            global_rate=TELEGRAM_GLOBAL_RATE / workers, global_burst=max(1, TELEGRAM_GLOBAL_BURST // workers)
+        )
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(job_queue.lease / 3)
+                await loop.run_in_executor(None, job_queue.renew, owner)
+
+        beat = loop.create_task(heartbeat())
+        logger.info(f"👷 Notification worker {worker_id} started ({owner})")
         try:
-            # Extract source name from URL
-            source_name = self._extract_source_name(article.get('source_url') or article.get('link'))
-            
-            # Format the message (plain text to avoid formatting issues)
-            message = f"📰 Նոր հոդված\n\n"
-            message += f"🌐 Կայք: {source_name}\n"
-            message += f"📰 Վերնագիր: {article.get('title')}\n"
-            message += f"🔗 Հղում: {article.get('link')}\n"
-            
-            if keywords and len(keywords) > 0:
-                keywords_text = ', '.join(keywords)
-                message += f"🔑 Բանալի բառեր ({len(keywords)}): {keywords_text}\n"
-                logger.info(f"📤 Ուղարկվում է {len(keywords)} բանալի բառ: {', '.join(keywords)}")
+            while stop is None or not stop.is_set():
+                claimed = await loop.run_in_executor(None, job_queue.claim, owner)
+                if not claimed:
+                    await asyncio.sleep(JOB_POLL_INTERVAL)
+                    continue
+                results = {}
+                for chat_id, jobs in claimed.items():
+                    for job_id, article, keywords in jobs:
+                        # A full local queue leaves the job leased; it is released below
+                        queue.enqueue(chat_id, article, keywords,
+                                      on_done=functools.partial(results.__setitem__, job_id))
+                await queue.join()
+                sent = [job_id for job_id, ok in results.items() if ok]
+                failed = [job_id for job_id, ok in results.items() if not ok]
+                await loop.run_in_executor(None, job_queue.complete, owner, sent)
+                if failed:
+                    given_up = await loop.run_in_executor(None, job_queue.retry_later, owner, failed)
+                    if given_up:
+                        logger.error(f"❌ {len(given_up)} notifications failed {JOB_MAX_ATTEMPTS} times, "
+                                     f"giving up (jobs {', '.join(map(str, given_up))})")
+                    if len(given_up) < len(failed):
+                        logger.warning(f"⚠️ {len(failed) - len(given_up)} notifications failed, "
+                                       f"retrying in {JOB_RETRY_DELAY:.0f}s")
+                if len(results) < sum(len(jobs) for jobs in claimed.values()):
+                    await loop.run_in_executor(None, job_queue.release, owner)
+        finally:
+            beat.cancel()
+            job_queue.release(owner)
+
+    async def flush_outbox(self):
+        """Send the backlog collected while paused as one compact digest per chat
+
+        Returns the number of articles delivered. A chat's rows are only
+        removed from the outbox after its digest was sent.
+        """
+        outbox = self._get_outbox()
+        backlog = await asyncio.get_running_loop().run_in_executor(None, outbox.pending)
+        if not backlog:
+            return 0
+        queue = self._get_notification_queue()
+        seen_store = self._get_seen_store()
+
+        async def flush(chat_id, rows):
+            # Latest entry per link, in arrival order
+            items = {}
+            for _, article, keywords in rows:
+                items.pop(self._seen_key(chat_id, article.get('link')), None)
+                items[self._seen_key(chat_id, article.get('link'))] = (article, keywords)
+            unseen = set(seen_store.filter_unseen(key for key in items if key))
+            items = [item for key, item in items.items() if not key or key in unseen]
+
+            if items:
+                shown = items[-RESUME_DIGEST_MAX_ARTICLES:]
+                messages = self._format_digest_messages(shown, f"📬 Դադարի ընթացքում ({len(items)} հոդված)")
+                if len(items) > len(shown):
+                    more = f"\n\n… և ևս {len(items) - len(shown)} ավելի հին հոդված"
+                    if len(messages[-1]) + len(more) <= MAX_MESSAGE_LENGTH:
+                        messages[-1] += more
+                    else:
+                        messages.append(more.strip())
+                for text in messages:
+                    await queue.acquire(chat_id)
+                    await self._send_message(chat_id=chat_id, text=text, disable_web_page_preview=True)
+                seen_store.add_many(self._seen_key(chat_id, article.get('link')) for article, _ in items)
+                NOTIFICATIONS_SENT.inc(len(items), mode='digest')
+            outbox.delete_through(chat_id, rows[-1][0])
+            return len(items)
+
+        chats = list(backlog)
+        results = await asyncio.gather(*(flush(chat_id, backlog[chat_id]) for chat_id in chats),
+                                       return_exceptions=True)
+        delivered = 0
+        for chat_id, result in zip(chats, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Outbox-ի ուղարկման սխալ ({chat_id}): {result}")
             else:
-                logger.info("📤 Բանալի բառեր չկան")
-            
-            # Handle created_at field - could be string or datetime
-            created_at = article.get('created_at')
-            if created_at:
-                if isinstance(created_at, str):
-                    time_str = created_at
-                else:
-                    time_str = created_at.strftime('%Y-%m-%d %H:%M:%S')
-                message += f"⏰ Ժամանակ: {time_str}"
-            
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                disable_web_page_preview=False
-            )
-            
-            logger.info(f"✅ Telegram ծանուցումը ուղարկվեց: {article.get('title', '')[:50]}...")
-            
-        except Exception as e:
-            logger.error(f"❌ Telegram ծանուցման սխալ: {e}")
+                delivered += result
+        logger.info(f"📬 Outbox-ից ուղարկվեց {delivered} հոդված")
+        return delivered
+
+    def _start_outbox_flush(self):
+        """Flush the outbox in the background unless a flush is already running"""
+        if self._outbox_flush_task is not None and not self._outbox_flush_task.done():
+            return self._outbox_flush_task
+        self._outbox_flush_task = self.submit(self.flush_outbox())
+        self._outbox_flush_task.add_done_callback(self._log_future_error)
+        return self._outbox_flush_task
 
     async def get_stats_data(self):
-        """Get statistics data via API - Now fully async"""
+        """Get statistics data via API - Now fully async
+
+        Results are reused for STATS_CACHE_TTL seconds, and concurrent callers
+        share a single in-flight fetch.
+        """
+        cached = self._stats_cache
+        if cached is not None and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+            return dict(cached[1])
+        task = self._stats_task
+        if task is None or task.done():
+            task = self._stats_task = asyncio.get_running_loop().create_task(self._fetch_stats())
+        return dict(await asyncio.shield(task))
+
+    async def _conditional_get(self, path, handler, endpoint=None, max_age=None):
+        """GET through _api_call, revalidating a cached result with its ETag/Last-Modified
+
+        `handler(response)` parses a 200 response; on 304 the value it
+        returned last time is reused. Entries fetched (with a 200) more than
+        `max_age` seconds ago are fetched unconditionally.
+        """
+        entry = self._http_cache.get(path)
+        if entry is not None and max_age is not None and time.monotonic() - entry[2] > max_age:
+            entry = None
+        headers = {}
+        if entry is not None:
+            if entry[0]:
+                headers['If-None-Match'] = entry[0]
+            if entry[1]:
+                headers['If-Modified-Since'] = entry[1]
+
+        async def read(response):
+            if response.status == 304 and entry is not None:
+                # Mark it recently used, keeping the original fetch time so max_age still bounds its age
+                self._http_cache[path] = self._http_cache.pop(path, entry)
+                return entry[3]
+            value = await handler(response)
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            if response.status == 200 and value is not None and (etag or last_modified):
+                self._http_cache.pop(path, None)
+                while len(self._http_cache) >= HTTP_CACHE_SIZE:
+                    self._http_cache.pop(next(iter(self._http_cache)))
+                self._http_cache[path] = (etag, last_modified, time.monotonic(), value)
+            return value
+
+        return await self._api_call('GET', path, read, endpoint=endpoint, headers=headers)
+
+    async def _fetch_stats(self):
+        """Fetch stats from /api/stats/, or compute them from the articles and keywords
+
+        While it is not known that /api/stats/ exists, the fallback requests
+        are issued concurrently with it and cancelled if it answers; if it
+        fails in any way, their result is awaited instead.
+        """
+        loop = asyncio.get_running_loop()
+        fallback = None
         try:
             import aiohttp
-            async with aiohttp.ClientSession() as session:
-                # Try to get stats from API
-                async with session.get(f"{API_BASE_URL}/api/stats/", timeout=10) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Failed to get stats from /api/stats/: Status {response.status}")
 
-                # If /api/stats/ doesn't exist, try to gather from articles and keywords APIs
-                async with session.get(f"{API_BASE_URL}/api/articles/", timeout=10) as articles_response:
-                    articles_data = []
-                    if articles_response.status == 200:
-                        articles_data = await articles_response.json()
-                    else:
-                        logger.warning(f"Failed to get articles from /api/articles/: Status {articles_response.status}")
+            async def read_stats(response):
+                if response.status == 200:
+                    return await response.json()
+                if response.status == 404:
+                    self._stats_endpoint = False
+                logger.error(f"Failed to get stats from /api/stats/: Status {response.status}")
+                return None
 
-                    total_articles = len(articles_data) if isinstance(articles_data, list) else 0
+            async def compute_stats():
+                stats, keywords = await asyncio.gather(self._stream_article_stats(), self.keyword_cache.get())
+                stats['total_keywords'] = len(keywords)
+                return stats
 
-                async with session.get(f"{API_BASE_URL}/api/keywords/", timeout=10) as keywords_response:
-                    total_keywords = 0
-                    if keywords_response.status == 200:
-                        keywords_list = await keywords_response.json()
-                        total_keywords = len(keywords_list) if isinstance(keywords_list, list) else 0
-                    else:
-                        logger.warning(f"Failed to get keywords from /api/keywords/: Status {keywords_response.status}")
-
-                # Note: For articles_24h, articles_week and top_sources calculation
-                # you'll need the /api/stats/ endpoint to provide this data,
-                # or you'll need to filter it from the complete data received from the API.
-                # Without timestamps, these will be 0 as they are now.
-                return {
-                    'articles_24h': 0,  # API needs to provide this
-                    'articles_week': 0,  # API needs to provide this
-                    'total_articles': total_articles,
-                    'total_keywords': total_keywords,
-                    'top_sources': []  # API needs to provide this
-                }
+            if self._stats_endpoint is not True:
+                fallback = loop.create_task(compute_stats())
+                # Retrieve its outcome even when it is cancelled or not awaited
+                fallback.add_done_callback(lambda task: task.cancelled() or task.exception())
+            if self._stats_endpoint is not False:
+                try:
+                    stats = await self._conditional_get('/api/stats/', read_stats)
+                except Exception as e:
+                    # Still answer from the articles and keywords (already being fetched)
+                    logger.error(f"Failed to get stats from /api/stats/: {e}")
+                    stats = None
+                if stats is not None:
+                    self._stats_endpoint = True
+                    if fallback is not None:
+                        fallback.cancel()
+                    self._stats_cache = (time.monotonic(), stats)
+                    return stats
+
+            # If /api/stats/ doesn't exist or failed, compute it from the articles and keywords
+            stats = await (fallback if fallback is not None else compute_stats())
+            self._stats_cache = (time.monotonic(), stats)
+            return stats
 
+        except CircuitOpenError as e:
+            logger.error(f"API stats request skipped: {e}")
         except aiohttp.ClientError as e:
             logger.error(f"API request failed with client error: {e}")
-            return {
-                'articles_24h': 0, 'articles_week': 0, 'total_articles': 0,
-                'total_keywords': 0, 'top_sources': []
-            }
         except Exception as e:
             logger.error(f"An unexpected error occurred during API stats request: {e}")
-            return {
-                'articles_24h': 0, 'articles_week': 0, 'total_articles': 0,
-                'total_keywords': 0, 'top_sources': []
-            }
+        finally:
+            if fallback is not None and not fallback.done():
+                fallback.cancel()
+        return {
+            'articles_24h': 0, 'articles_week': 0, 'total_articles': 0,
+            'total_keywords': 0, 'top_sources': []
+        }
+
+    async def _stream_article_stats(self):
+        """Compute article stats from /api/articles/ in one streaming pass
+
+        Records are parsed one at a time straight off the socket, so memory
+        use does not grow with the size of the archive. Paginated responses
+        are followed through their "next" links.
+        """
+        now = datetime.now(timezone.utc)
+        day_ago = now - timedelta(days=1)
+        week_ago = now - timedelta(days=7)
+
+        async def count_page(articles_response):
+            # Counts are per page so that a retried request starts from zero
+            page = {'total': 0, 'day': 0, 'week': 0, 'sources': Counter(), 'meta': {}}
+            if articles_response.status != 200:
+                logger.warning(f"Failed to get articles from /api/articles/: Status {articles_response.status}")
+                return None
+
+            parser = JSONArrayStream()
+            chunks = articles_response.content.iter_chunked(ARTICLES_STREAM_CHUNK_SIZE)
+            final = False
+            while not final:
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    chunk, final = b'', True
+                for article in parser.feed(chunk, final):
+                    page['total'] += 1
+                    if not isinstance(article, dict):
+                        continue
+                    created_at = _parse_timestamp(article.get('created_at'))
+                    if created_at is None or created_at < week_ago:
+                        continue
+                    page['week'] += 1
+                    if created_at >= day_ago:
+                        page['day'] += 1
+                    page['sources'][self._source_key(article.get('source_url') or article.get('link'))] += 1
+            page['meta'] = parser.meta
+            return page
+
+        total_articles = 0
+        articles_24h = 0
+        articles_week = 0
+        reported_total = None
+        sources = Counter()
+
+        url = '/api/articles/'
+        while url:
+            page = await self._conditional_get(url, count_page, max_age=ARTICLES_REVALIDATE_MAX_AGE)
+            if page is None:
+                break
+            total_articles += page['total']
+            articles_24h += page['day']
+            articles_week += page['week']
+            sources.update(page['sources'])
+            if reported_total is None and isinstance(page['meta'].get('count'), int):
+                reported_total = page['meta']['count']
+            url = page['meta'].get('next')
+
+        return {
+            'articles_24h': articles_24h,
+            'articles_week': articles_week,
+            'total_articles': reported_total if reported_total is not None else total_articles,
+            'total_keywords': 0,
+            'top_sources': [
+                {'source_url': source_url, 'count': count}
+                for source_url, count in sources.most_common(TOP_SOURCES_LIMIT)
+            ]
+        }
+
+    @staticmethod
+    def _source_key(url):
+        """Reduce an article or source URL to its site root for per-source counting"""
+        if not url:
+            return ''
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else url
 
     async def handle_stats_command(self, update, context):
         """Handle /stats command - Now fully async"""
@@ -166,7 +2752,7 @@ class TelegramNotifier:
                 source_name = self._extract_source_name(source['source_url'])
                 stats_message += f"\n  • {source_name}: {source['count']} հոդված"
 
-            await self.bot.send_message(chat_id=update.message.chat_id, text=stats_message)
+            await self._send_message(chat_id=update.message.chat_id, text=stats_message)
             
         except Exception as e:
             # Safe error message formatting
@@ -179,44 +2765,164 @@ class TelegramNotifier:
             # Don't try to send error message to avoid Message object issues
 
     async def get_keywords_data(self):
-        """Get keywords data via API - Now fully async"""
+        """Get keywords data, served from the in-process keyword cache"""
+        return await self.keyword_cache.get()
+
+    def _sync_keyword_matcher(self, keywords):
+        """Bring the local matcher in line with a freshly fetched keyword list plus all subscriptions"""
+        words = [_keyword_word(keyword) for keyword in keywords]
+        self._global_keywords = {KeywordMatcher.normalize(word).strip() for word in words}
+        self.keyword_matcher.sync(words + self._get_subscriptions().all_keywords())
+
+    def _add_global_keyword(self, word):
+        if self._global_keywords is not None:
+            self._global_keywords.add(KeywordMatcher.normalize(word).strip())
+        self.keyword_matcher.add(word)
+
+    def _remove_global_keyword(self, word):
+        if self._global_keywords is not None:
+            self._global_keywords.discard(KeywordMatcher.normalize(word).strip())
+        # Subscribers of the same word still need it matched
+        if not self._get_subscriptions().has_keyword(word):
+            self.keyword_matcher.remove(word)
+
+    async def match_article(self, article):
+        """Return the current keywords found in an article's title and body"""
+        if self._global_keywords is None:
+            self._get_subscriptions()
+            # Make sure the keyword list has been loaded at least once
+            await self.keyword_cache.get()
+        return self.keyword_matcher.match_article(article)
+
+    async def notify_if_matched(self, article, on_done=None):
+        """Match an article locally and queue a notification if any keyword hits"""
+        keywords = await self.match_article(article)
+        if keywords:
+            self.enqueue(article, keywords, on_done)
+        return keywords
+
+    async def _fetch_keywords(self):
+        """Fetch keywords from the API, returning None if the request failed"""
         try:
             import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{API_BASE_URL}/api/keywords/", timeout=10) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"Failed to get keywords from /api/keywords/: Status {response.status}")
-                        return []
+
+            async def read_keywords(response):
+                if response.status == 200:
+                    keywords = await response.json()
+                    return keywords if isinstance(keywords, list) else []
+                else:
+                    logger.error(f"Failed to get keywords from /api/keywords/: Status {response.status}")
+                    return None
+
+            return await self._conditional_get('/api/keywords/', read_keywords)
+        except CircuitOpenError as e:
+            logger.error(f"API keywords request skipped: {e}")
+            return None
         except aiohttp.ClientError as e:
             logger.error(f"API keywords request failed with client error: {e}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"An unexpected error occurred during API keywords request: {e}")
-            return []
+            return None
+
+    async def get_keywords_page(self, page, page_size=KEYWORDS_PAGE_SIZE):
+        """Return (keywords, total) for a 1-based page, or None if the API request failed
+
+        Pages come from the paginated keywords API and are cached. If the API
+        returns the whole list instead, pages are sliced from the keyword cache.
+        """
+        cached = self._keyword_pages.get(page)
+        if cached is not None and time.monotonic() - cached[0] < KEYWORDS_CACHE_TTL:
+            return cached[1], cached[2]
+
+        if self._keywords_paginated is False:
+            keywords = await self.keyword_cache.get()
+            start = (page - 1) * page_size
+            return keywords[start:start + page_size], len(keywords)
+
+        try:
+            import aiohttp
+
+            async def read_page(response):
+                if response.status == 404:
+                    # Page out of range
+                    return [], None
+                if response.status != 200:
+                    logger.error(f"Failed to get keywords page {page} from /api/keywords/: Status {response.status}")
+                    return None
+                data = await response.json()
+                if isinstance(data, list):
+                    # The API ignores pagination and returned every keyword
+                    self._keywords_paginated = False
+                    start = (page - 1) * page_size
+                    return data[start:start + page_size], len(data)
+
+                self._keywords_paginated = True
+                keywords = data.get('results') if isinstance(data, dict) else None
+                keywords = keywords if isinstance(keywords, list) else []
+                total = data.get('count', len(keywords)) if isinstance(data, dict) else 0
+                self._keyword_pages[page] = (time.monotonic(), keywords, total)
+                return keywords, total
+
+            return await self._api_call('GET', '/api/keywords/', read_page,
+                                        params={'page': page, 'page_size': page_size})
+        except CircuitOpenError as e:
+            logger.error(f"API keywords page request skipped: {e}")
+            return None
+        except aiohttp.ClientError as e:
+            logger.error(f"API keywords page request failed with client error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"An unexpected error occurred during API keywords page request: {e}")
+            return None
+
+    def _invalidate_keyword_pages(self):
+        self._keyword_pages.clear()
+
+    @staticmethod
+    def _format_keywords_page(keywords, page, total, page_size=KEYWORDS_PAGE_SIZE):
+        """Render one /keywords page and its navigation keyboard"""
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+        pages = max(1, math.ceil(total / page_size))
+        offset = (page - 1) * page_size
+        lines = [f"🔑 Ընթացիկ բանալի բառեր (էջ {page}/{pages}):", ""]
+        lines.extend(f"{offset + i}. {_keyword_word(keyword)[:KEYWORD_DISPLAY_LIMIT]}"
+                     for i, keyword in enumerate(keywords, 1))
+        lines.extend(["", f"📝 Ընդհանուր: {total} բանալի բառ"])
+
+        buttons = []
+        if page > 1:
+            buttons.append(InlineKeyboardButton("⬅️ Նախորդ", callback_data=f"keywords:{page - 1}"))
+        if page < pages:
+            buttons.append(InlineKeyboardButton("Հաջորդ ➡️", callback_data=f"keywords:{page + 1}"))
+        return '\n'.join(lines), InlineKeyboardMarkup([buttons]) if buttons else None
+
+    async def _render_keywords_page(self, page):
+        """Return (text, reply_markup) for a /keywords page; text is None when there is nothing to show"""
+        result = await self.get_keywords_page(page)
+        if result is None:
+            return "❌ Չհաջողվեց ստանալ բանալի բառերը", None
+        keywords, total = result
+        if page > 1 and (total is None or not keywords):
+            # Asked past the last page (e.g. keywords were removed); show the first one
+            return await self._render_keywords_page(1)
+        if not keywords or not total:
+            return None, None
+        return self._format_keywords_page(keywords, page, total)
 
     async def handle_keywords_command(self, update, context):
-        """Handle /keywords command - Now fully async"""
+        """Handle /keywords [page] command - Now fully async"""
         try:
-            keywords = await self.get_keywords_data()
-            
-            if not keywords:
-                await self.bot.send_message(chat_id=update.message.chat_id, text="❌ Բանալի բառեր չկան")
+            args = getattr(context, 'args', None) or []
+            page = int(args[0]) if args and args[0].isdigit() and int(args[0]) > 0 else 1
+            text, reply_markup = await self._render_keywords_page(page)
+
+            if text is None:
+                await self._send_message(chat_id=update.message.chat_id, text="❌ Բանալի բառեր չկան")
                 return
-            
-            keywords_text = "🔑 Ընթացիկ բանալի բառեր:\n\n"
-            for i, keyword in enumerate(keywords, 1):
-                # Handle both dictionary and object formats
-                if isinstance(keyword, dict):
-                    keyword_text = keyword.get('word', str(keyword))
-                else:
-                    keyword_text = keyword.word if hasattr(keyword, 'word') else str(keyword)
-                keywords_text += f"{i}. {keyword_text}\n"
-            
-            keywords_text += f"\n📝 Ընդհանուր: {len(keywords)} բանալի բառ"
-            
-            await self.bot.send_message(chat_id=update.message.chat_id, text=keywords_text)
+
+            await self._send_message(chat_id=update.message.chat_id, text=text, reply_markup=reply_markup)
             
         except Exception as e:
             # Safe error message formatting
@@ -228,33 +2934,63 @@ class TelegramNotifier:
             logger.error(f"❌ Սխալ: {error_msg}")
             # Don't try to send error message to avoid Message object issues
 
+    async def handle_keywords_callback(self, update, context):
+        """Handle the next/previous buttons of a /keywords page by editing it in place"""
+        query = update.callback_query
+        try:
+            page = max(1, int(query.data.split(':', 1)[1]))
+        except (IndexError, ValueError):
+            page = 1
+
+        text, reply_markup = await self._render_keywords_page(page)
+        try:
+            await self._telegram_call(
+                'edit_message_text', chat_id=query.message.chat_id, message_id=query.message.message_id,
+                text=text or "❌ Բանալի բառեր չկան", reply_markup=reply_markup
+            )
+        except BadRequest as e:
+            # Pressing a button for the page already shown is not an error
+            if 'not modified' not in str(e).lower():
+                raise
+        finally:
+            await self._telegram_call('answer_callback_query', callback_query_id=query.id)
+
     async def handle_pause_command(self, update, context):
         """Handle /pause command - Now async"""
         self.notifications_paused = True
-        await self.bot.send_message(chat_id=update.message.chat_id, text="🔇 Ծանուցումները դադարեցվել են\n\nԱկտիվացնելու համար օգտագործեք /resume")
+        await self._send_message(chat_id=update.message.chat_id, text="🔇 Ծանուցումները դադարեցվել են\n\nՆոր հոդվածները կպահվեն և կուղարկվեն ամփոփմամբ\nԱկտիվացնելու համար օգտագործեք /resume")
 
     async def handle_resume_command(self, update, context):
         """Handle /resume command - Now async"""
         self.notifications_paused = False
-        await self.bot.send_message(chat_id=update.message.chat_id, text="🔔 Ծանուցումները ակտիվացվել են")
+        backlog = len(self._get_outbox())
+        text = "🔔 Ծանուցումները ակտիվացվել են"
+        if backlog:
+            text += f"\n\n📬 Դադարի ընթացքում կուտակված {backlog} ծանուցում կուղարկվի ամփոփմամբ"
+        await self._send_message(chat_id=update.message.chat_id, text=text)
+        if backlog:
+            self._start_outbox_flush()
 
     async def add_keyword(self, keyword_text):
         """Add keyword via API - Now fully async"""
         try:
             import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{API_BASE_URL}/api/keywords/",
-                    json={'word': keyword_text},
-                    timeout=10
-                ) as response:
-                    if response.status == 201:
-                        return await response.json(), True
-                    elif response.status == 200:
-                        return await response.json(), False  # Already exists
-                    else:
-                        logger.error(f"Failed to add keyword via API: Status {response.status}")
-                        return None, False
+
+            async def read_created(response):
+                if response.status in (200, 201):
+                    keyword_obj = await response.json()
+                    self.keyword_cache.add(keyword_obj if isinstance(keyword_obj, dict) else {'word': keyword_text})
+                    self._invalidate_keyword_pages()
+                    self._add_global_keyword(keyword_text)
+                    return keyword_obj, response.status == 201  # 200 means it already exists
+                else:
+                    logger.error(f"Failed to add keyword via API: Status {response.status}")
+                    return None, False
+
+            return await self._api_call('POST', '/api/keywords/', read_created, json={'word': keyword_text})
+        except CircuitOpenError as e:
+            logger.error(f"API add keyword request skipped: {e}")
+            return None, False
         except aiohttp.ClientError as e:
             logger.error(f"API add keyword request failed with client error: {e}")
             return None, False
@@ -266,16 +3002,16 @@ class TelegramNotifier:
         """Handle /add_keyword command - Now fully async"""
         try:
             if not context.args:
-                await self.bot.send_message(chat_id=update.message.chat_id, text="❌ Գրեք բանալի բառը\n\nՕրինակ: /add_keyword Հայաստան")
+                await self._send_message(chat_id=update.message.chat_id, text="❌ Գրեք բանալի բառը\n\nՕրինակ: /add_keyword Հայաստան")
                 return
             
             keyword_text = " ".join(context.args).strip()
             keyword_obj, created = await self.add_keyword(keyword_text)
             
             if created:
-                await self.bot.send_message(chat_id=update.message.chat_id, text=f"✅ Ավելացվել է բանալի բառ: {keyword_text}")
+                await self._send_message(chat_id=update.message.chat_id, text=f"✅ Ավելացվել է բանալի բառ: {keyword_text}")
             else:
-                await self.bot.send_message(chat_id=update.message.chat_id, text=f"🔄 Արդեն գոյություն ունի: {keyword_text}")
+                await self._send_message(chat_id=update.message.chat_id, text=f"🔄 Արդեն գոյություն ունի: {keyword_text}")
                 
         except Exception as e:
             # Safe error message formatting
@@ -288,41 +3024,51 @@ class TelegramNotifier:
             # Don't try to send error message to avoid Message object issues
 
     async def remove_keyword(self, keyword_text):
-        """Remove keyword via API - Now fully async"""
+        """Remove keyword via API, returning the deleted count or None if the request failed"""
         try:
             import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.delete(
-                    f"{API_BASE_URL}/api/keywords/{keyword_text}/",
-                    timeout=10
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get('deleted_count', 0)
-                    else:
-                        logger.error(f"Failed to remove keyword via API: Status {response.status}")
-                        return 0
+
+            async def read_deleted(response):
+                if response.status == 200:
+                    result = await response.json()
+                    deleted_count = result.get('deleted_count', 0)
+                    if deleted_count:
+                        self._remove_global_keyword(keyword_text)
+                        self._invalidate_keyword_pages()
+                        if self.keyword_cache.remove(keyword_text) != deleted_count:
+                            # The API matched differently than the cache did, re-sync it
+                            self.keyword_cache.invalidate()
+                    return deleted_count
+                else:
+                    logger.error(f"Failed to remove keyword via API: Status {response.status}")
+                    return None
+
+            return await self._api_call('DELETE', f'/api/keywords/{keyword_text}/', read_deleted,
+                                        endpoint='/api/keywords/{word}/')
+        except CircuitOpenError as e:
+            logger.error(f"API remove keyword request skipped: {e}")
+            return None
         except aiohttp.ClientError as e:
             logger.error(f"API remove keyword request failed with client error: {e}")
-            return 0
+            return None
         except Exception as e:
             logger.error(f"An unexpected error occurred during API remove keyword request: {e}")
-            return 0
+            return None
 
     async def handle_remove_keyword_command(self, update, context):
         """Handle /remove_keyword command - Now fully async"""
         try:
             if not context.args:
-                await self.bot.send_message(chat_id=update.message.chat_id, text="❌ Գրեք բանալի բառը\n\nՕրինակ: /remove_keyword Հայաստան")
+                await self._send_message(chat_id=update.message.chat_id, text="❌ Գրեք բանալի բառը\n\nՕրինակ: /remove_keyword Հայաստան")
                 return
             
             keyword_text = " ".join(context.args).strip()
             deleted_count = await self.remove_keyword(keyword_text)
             
-            if deleted_count > 0:
-                await self.bot.send_message(chat_id=update.message.chat_id, text=f"🗑️ Ջնջվել է բանալի բառ: {keyword_text}")
+            if deleted_count:
+                await self._send_message(chat_id=update.message.chat_id, text=f"🗑️ Ջնջվել է բանալի բառ: {keyword_text}")
             else:
-                await self.bot.send_message(chat_id=update.message.chat_id, text=f"❌ Բանալի բառը չգտնվեց: {keyword_text}")
+                await self._send_message(chat_id=update.message.chat_id, text=f"❌ Բանալի բառը չգտնվեց: {keyword_text}")
                 
         except Exception as e:
             # Safe error message formatting
@@ -334,18 +3080,231 @@ class TelegramNotifier:
             logger.error(f"❌ Սխալ: {error_msg}")
             # Don't try to send error message to avoid Message object issues
 
+    @staticmethod
+    def _command_argument_text(update, context):
+        """Return everything after the command, keeping line breaks"""
+        text = update.message.text if update and update.message and update.message.text else ''
+        parts = text.split(None, 1)
+        if len(parts) == 2 and parts[0].startswith('/'):
+            return parts[1]
+        return " ".join(getattr(context, 'args', None) or [])
+
+    @staticmethod
+    def _parse_keyword_list(text):
+        """Split a comma- or newline-separated keyword list, dropping blanks and duplicates"""
+        words = {}
+        for word in re.split(r'[,\n]', text):
+            word = ' '.join(word.split())
+            if word:
+                words.setdefault(word.casefold(), word)
+        return list(words.values())
+
+    async def _bulk_keyword_call(self, path, words, read_result):
+        """POST words to a batch endpoint; returns None when the API has no such endpoint or rejects the batch"""
+        if self._keywords_bulk_api is False:
+            return None
+
+        async def read_response(response):
+            if response.status in (404, 405):
+                self._keywords_bulk_api = False
+                return None
+            if response.status not in (200, 201):
+                # Rejected batch (e.g. a validation error): not an outage, so don't raise
+                # a retryable error; the per-word calls report each word instead
+                logger.warning(f"Bulk keywords request to {path} rejected: Status {response.status}")
+                return None
+            self._keywords_bulk_api = True
+            return read_result(await response.json())
+
+        return await self._api_call('POST', path, read_response, json={'words': words})
+
+    async def _run_bulk(self, func, words):
+        """Run func(word) for every word, at most BULK_KEYWORDS_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(BULK_KEYWORDS_CONCURRENCY)
+
+        async def run(word):
+            async with semaphore:
+                return await func(word)
+
+        return await asyncio.gather(*(run(word) for word in words))
+
+    async def add_keywords(self, words):
+        """Add several keywords, returning {'created': [...], 'existing': [...], 'failed': [...]}"""
+        def read_created(result):
+            created = [str(word) for word in result.get('created', [])]
+            existing = [str(word) for word in result.get('existing', [])]
+            for word in created:
+                self.keyword_cache.add({'word': word})
+                self._add_global_keyword(word)
+            if created:
+                self._invalidate_keyword_pages()
+            done = {word.casefold() for word in created + existing}
+            return {'created': created, 'existing': existing,
+                    'failed': [word for word in words if word.casefold() not in done]}
+
+        try:
+            summary = await self._bulk_keyword_call('/api/keywords/bulk/', words, read_created)
+            if summary is not None:
+                return summary
+        except Exception as e:
+            logger.error(f"API bulk add keywords request failed: {e}")
+            return {'created': [], 'existing': [], 'failed': list(words)}
+
+        summary = {'created': [], 'existing': [], 'failed': []}
+        results = await self._run_bulk(self.add_keyword, words)
+        for word, (keyword_obj, created) in zip(words, results):
+            summary['created' if created else 'existing' if keyword_obj is not None else 'failed'].append(word)
+        return summary
+
+    async def remove_keywords(self, words):
+        """Remove several keywords, returning {'deleted': [...], 'not_found': [...], 'failed': [...]}"""
+        def read_deleted(result):
+            deleted = [str(word) for word in result.get('deleted', [])]
+            not_found = [str(word) for word in result.get('not_found', [])]
+            for word in deleted:
+                self._remove_global_keyword(word)
+                self.keyword_cache.remove(word)
+            if deleted:
+                self._invalidate_keyword_pages()
+            done = {word.casefold() for word in deleted + not_found}
+            return {'deleted': deleted, 'not_found': not_found,
+                    'failed': [word for word in words if word.casefold() not in done]}
+
+        try:
+            summary = await self._bulk_keyword_call('/api/keywords/bulk_delete/', words, read_deleted)
+            if summary is not None:
+                return summary
+        except Exception as e:
+            logger.error(f"API bulk remove keywords request failed: {e}")
+            return {'deleted': [], 'not_found': [], 'failed': list(words)}
+
+        summary = {'deleted': [], 'not_found': [], 'failed': []}
+        results = await self._run_bulk(self.remove_keyword, words)
+        for word, deleted_count in zip(words, results):
+            summary['failed' if deleted_count is None else 'deleted' if deleted_count else 'not_found'].append(word)
+        return summary
+
+    @staticmethod
+    def _format_bulk_summary(title, rows, failed):
+        """One-pass summary reply for the bulk keyword commands"""
+        lines = [title, ""]
+        lines.extend(f"{label}: {count}" for label, count in rows)
+        if failed:
+            shown = ", ".join(word[:KEYWORD_DISPLAY_LIMIT] for word in failed[:20])
+            more = f" (+{len(failed) - 20})" if len(failed) > 20 else ""
+            lines.extend(["", f"❌ Չստացվեց: {shown}{more}"])
+        return '\n'.join(lines)
+
+    async def _read_bulk_words(self, update, context, example):
+        """Parse the bulk command's keyword list, replying with usage help if it is empty or too long"""
+        words = self._parse_keyword_list(self._command_argument_text(update, context))
+        if not words:
+            await self._send_message(chat_id=update.message.chat_id,
+                                     text=f"❌ Գրեք բանալի բառերը՝ ստորակետով կամ նոր տողով բաժանված\n\nՕրինակ: {example}")
+            return None
+        if len(words) > BULK_KEYWORDS_LIMIT:
+            await self._send_message(chat_id=update.message.chat_id,
+                                     text=f"❌ Առավելագույնը {BULK_KEYWORDS_LIMIT} բանալի բառ մեկ հրամանով")
+            return None
+        return words
+
+    async def handle_add_keywords_command(self, update, context):
+        """Handle /add_keywords command: add a comma- or newline-separated list"""
+        words = await self._read_bulk_words(update, context, "/add_keywords Հայաստան, տնտեսություն, կրթություն")
+        if words is None:
+            return
+        summary = await self.add_keywords(words)
+        text = self._format_bulk_summary(f"📦 Բանալի բառեր ({len(words)}):", [
+            ("✅ Ավելացվել է", len(summary['created'])),
+            ("🔄 Արդեն գոյություն ունի", len(summary['existing'])),
+            ("❌ Սխալ", len(summary['failed'])),
+        ], summary['failed'])
+        await self._send_message(chat_id=update.message.chat_id, text=text)
+
+    async def handle_remove_keywords_command(self, update, context):
+        """Handle /remove_keywords command: remove a comma- or newline-separated list"""
+        words = await self._read_bulk_words(update, context, "/remove_keywords Հայաստան, տնտեսություն")
+        if words is None:
+            return
+        summary = await self.remove_keywords(words)
+        text = self._format_bulk_summary(f"📦 Բանալի բառեր ({len(words)}):", [
+            ("🗑️ Ջնջվել է", len(summary['deleted'])),
+            ("🔍 Չգտնվեց", len(summary['not_found'])),
+            ("❌ Սխալ", len(summary['failed'])),
+        ], summary['failed'])
+        await self._send_message(chat_id=update.message.chat_id, text=text)
+
+    async def handle_subscribe_command(self, update, context):
+        """Handle /subscribe command: get notified in this chat about a comma- or newline-separated list"""
+        words = await self._read_bulk_words(update, context, "/subscribe Հայաստան, տնտեսություն")
+        if words is None:
+            return
+        added, existing, over_limit = self._get_subscriptions().subscribe(update.message.chat_id, words)
+        for word in added:
+            self.keyword_matcher.add(word)
+        rows = [("✅ Բաժանորդագրվել եք", len(added)), ("🔄 Արդեն կար", len(existing))]
+        text = self._format_bulk_summary(f"🔔 Բաժանորդագրություն ({len(words)}):", rows, over_limit)
+        if over_limit:
+            text += f"\n\n⚠️ Առավելագույնը {SUBSCRIPTION_KEYWORDS_LIMIT} բառ մեկ chat-ի համար"
+        await self._send_message(chat_id=update.message.chat_id, text=text)
+
+    async def handle_unsubscribe_command(self, update, context):
+        """Handle /unsubscribe command: drop some (or, with "all", every) subscription of this chat"""
+        text = self._command_argument_text(update, context)
+        if text.strip().lower() in ('all', 'բոլորը'):
+            words = None
+        else:
+            words = await self._read_bulk_words(update, context, "/unsubscribe Հայաստան (կամ /unsubscribe all)")
+            if words is None:
+                return
+        subscriptions = self._get_subscriptions()
+        removed = subscriptions.unsubscribe(update.message.chat_id, words)
+        global_keywords = self._global_keywords or set()
+        for word in removed:
+            if KeywordMatcher.normalize(word).strip() not in global_keywords and not subscriptions.has_keyword(word):
+                self.keyword_matcher.remove(word)
+        await self._send_message(chat_id=update.message.chat_id,
+                                 text=f"🔕 Բաժանորդագրությունը չեղարկվեց: {len(removed)} բառ")
+
+    async def handle_subscriptions_command(self, update, context):
+        """Handle /subscriptions command: list this chat's keywords"""
+        keywords = self._get_subscriptions().keywords(update.message.chat_id)
+        if not keywords:
+            await self._send_message(chat_id=update.message.chat_id,
+                                     text="❌ Բաժանորդագրություններ չկան\n\nՕրինակ: /subscribe Հայաստան, տնտեսություն")
+            return
+        # Long lists are split over several messages at line boundaries
+        chunks, lines, size = [], [f"🔔 Ձեր բանալի բառերը ({len(keywords)}):", ""], 0
+        for i, keyword in enumerate(keywords, 1):
+            line = f"{i}. {keyword[:KEYWORD_DISPLAY_LIMIT]}"
+            if size + len(line) + 1 > MAX_MESSAGE_LENGTH - 100:
+                chunks.append('\n'.join(lines))
+                lines, size = [], 0
+            lines.append(line)
+            size += len(line) + 1
+        chunks.append('\n'.join(lines))
+        for text in chunks:
+            await self._send_message(chat_id=update.message.chat_id, text=text)
+
     async def handle_help_command(self, update, context):
         """Handle /help command - Now async"""
         help_text = """🤖 Telegram բոտի հրամաններ:
 
 📊 /stats - վիճակագրություն
-🔑 /keywords - ընթացիկ բանալի բառեր  
+🔑 /keywords [էջ] - ընթացիկ բանալի բառեր  
 🔇 /pause - ծանուցումները դադարեցնել
 🔔 /resume - ծանուցումները ակտիվացնել
 
 Բանալի բառերի կառավարում:
 ➕ /add_keyword [բառ] - բանալի բառ ավելացնել
 🗑️ /remove_keyword [բառ] - բանալի բառ ջնջել
+📦 /add_keywords [բառ, բառ, ...] - մի քանի բառ միանգամից
+📦 /remove_keywords [բառ, բառ, ...] - մի քանի բառ ջնջել
+
+Անձնական ծանուցումներ այս chat-ում:
+🔔 /subscribe [բառ, բառ, ...] - բաժանորդագրվել
+🔕 /unsubscribe [բառ, ...|all] - չեղարկել
+📋 /subscriptions - ձեր բառերը
 
 ℹ️ /help - այս ցուցակը
 
@@ -353,139 +3312,445 @@ class TelegramNotifier:
 /add_keyword Հայաստան
 /remove_keyword տնտեսություն"""
 
-        await self.bot.send_message(chat_id=update.message.chat_id, text=help_text)
+        await self._send_message(chat_id=update.message.chat_id, text=help_text)
 
     def _extract_source_name(self, url):
         """Extract a readable source name from URL"""
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            
-            # Remove www. prefix
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            
-            # Map known domains to Armenian names
-            domain_names = {
-                'armenpress.am': 'Armenpress',
-                'news.am': 'News.am',
-                'panorama.am': 'Panorama.am',
-                'asbarez.com': 'Asbarez',
-                'aysor.am': 'Aysor',
-                'lurer.com': 'Lurer',
-                'tert.am': 'Tert.am',
-                'armtimes.com': 'Armtimes',
-                'yerkir.am': 'Yerkir',
-                'armlur.am': 'Armlur',
-                'mamul.am': 'Mamul',
-                'past.am': 'Past.am',
-                'armday.am': 'Armday',
-                'hayeli.am': 'Hayeli',
-                'blognews.am': 'Blognews',
-                'slaq.am': 'Slaq',
-                'irakanum.am': 'Irakanum',
-                'norlur.am': 'Norlur',
-                'newday.am': 'Newday',
-                'politik.am': 'Politik',
-                'pastinfo.am': 'Pastinfo',
-                'hayacq.am': 'Hayacq',
-                'yerevan-today.com': 'Yerevan Today',
-                'armeniatoday.news': 'Armenia Today',
-                'armlife.am': 'Armlife',
-                '168.am': '168.am',
-                '7or.am': '7or.am'
-            }
-            
-            return domain_names.get(domain, domain.title())
-        except:
-            return url
+        return SOURCE_REGISTRY.name_for_url(url)
     
-    def send_article_sync(self, article, keywords=None):
-        """Synchronous wrapper for sending article notifications"""
-        loop = None
+    def send_article_sync(self, article, keywords=None, wait=True, timeout=None):
+        """Synchronous wrapper for sending article notifications
+
+        With wait=False the notification is sent in the background and the
+        concurrent.futures.Future is returned immediately.
+        """
         try:
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Run the async function
-            loop.run_until_complete(self.send_article_notification(article, keywords))
-            
+            future = self.submit(self.send_article_notification(article, keywords))
+        except Exception as e:
+            logger.error(f"❌ Telegram sync ծանուցման սխալ: {e}")
+            return None
+
+        if not wait:
+            future.add_done_callback(self._log_future_error)
+            return future
+
+        try:
+            future.result(timeout)
         except Exception as e:
             logger.error(f"❌ Telegram sync ծանուցման սխալ: {e}")
+        return future
+
+    @staticmethod
+    def _log_future_error(future):
+        """Log errors of fire-and-forget background work"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"❌ Telegram sync ծանուցման սխալ: {error}")
+
+    async def _run_command(self, async_func, update, context):
+        """Run a command handler, replying with a generic error message if it fails"""
+        started = time.perf_counter()
+        try:
+            await async_func(update, context)
+        except Exception as e:
+            COMMAND_ERRORS.inc(command=async_func.__name__)
+            # Միշտ լոգավորեք ամբողջական սխալը՝ հետագա վերլուծության համար
+            # exc_info=True-ը կապահովի ամբողջական հետագծի տպումը լոգերում
+            logger.error(f"❌ Handler error in {async_func.__name__}: {e}", exc_info=True)
+
+            # Փորձեք ուղարկել ընդհանուր սխալի հաղորդագրություն օգտատիրոջը
+            try:
+                if update and update.message:
+                    # Ավելի ընդհանուր, կայուն հաղորդագրություն օգտատիրոջ համար
+                    # Մենք ԱՅԼԵՎՍ ՉԵՆՔ օգտագործում str(e)-ը այստեղ,
+                    # որպեսզի խուսափենք հենց այդ Message օբյեկտի սխալից
+                    user_error_text = "❌ Ծանր սխալ տեղի ունեցավ հրամանը մշակելիս։ Խնդրում ենք փորձել կրկին կամ կապվել ադմինիստրատորի հետ։"
+                    await self._send_message(chat_id=update.message.chat_id, text=user_error_text)
+                else:
+                    logger.warning("Could not send error message: update or update.message is missing.")
+            except Exception as send_error:
+                logger.error(f"❌ Failed to send error message to user: {send_error}")
+        finally:
+            COMMAND_LATENCY.observe(time.perf_counter() - started, command=async_func.__name__)
+
+    def _get_command_executor(self):
+        """Return the command executor, creating it on the background loop on first use"""
+        if self._command_executor is None:
+            self._command_executor = CommandExecutor(self._ensure_loop())
+        return self._command_executor
+
+    def command_stats(self):
+        """Return in-flight and queued command counts"""
+        if self._command_executor is None:
+            return {'in_flight': 0, 'queued': 0, 'completed': 0, 'rejected': 0, 'concurrency': COMMAND_CONCURRENCY}
+        return self._command_executor.stats()
+
+    def dispatch_command(self, async_func, update, context):
+        """Queue a command handler without blocking; replies "busy" if the executor is saturated"""
+        chat = update.effective_chat if update else None
+        chat_id = chat.id if chat else None
+        if self._get_command_executor().submit(chat_id, self._run_command, async_func, update, context):
+            return True
+
+        logger.warning(f"⚠️ Command queue is full, rejecting {async_func.__name__}")
+        if chat_id is not None:
+            future = self.submit(self._send_message(
+                chat_id=chat_id,
+                text="⏳ Բոտը հիմա զբաղված է։ Խնդրում ենք փորձել մի փոքր ուշ։"
+            ))
+            future.add_done_callback(self._log_future_error)
+        return False
+
+    def _command_handlers(self):
+        """Map command names to their handler coroutines"""
+        return {
+            "stats": self.handle_stats_command,
+            "keywords": self.handle_keywords_command,
+            "pause": self.handle_pause_command,
+            "resume": self.handle_resume_command,
+            "add_keyword": self.handle_add_keyword_command,
+            "remove_keyword": self.handle_remove_keyword_command,
+            "add_keywords": self.handle_add_keywords_command,
+            "remove_keywords": self.handle_remove_keywords_command,
+            "subscribe": self.handle_subscribe_command,
+            "unsubscribe": self.handle_unsubscribe_command,
+            "subscriptions": self.handle_subscriptions_command,
+            "help": self.handle_help_command,
+            "start": self.handle_help_command,
+        }
+
+    def _callback_handlers(self):
+        """Map inline-button callback data prefixes ("prefix:...") to their handler coroutines"""
+        return {
+            "keywords": self.handle_keywords_callback,
+        }
+
+    def process_update(self, data):
+        """Dispatch one raw Telegram update (as received by the webhook) to its command handler"""
+        from telegram import Update
+        update = Update.de_json(data, self.bot)
+        query = update.callback_query if update else None
+        if query is not None:
+            handler = self._callback_handlers().get((query.data or '').split(':', 1)[0])
+            if handler is None:
+                return False
+            return self.dispatch_command(handler, update, CommandContext(self.bot))
+
+        message = update.message if update else None
+        if message is None or not message.text or not message.text.startswith('/'):
+            return False
+
+        command, *args = message.text.split()
+        command, _, mention = command[1:].partition('@')
+        if mention and self._bot_username and mention.lower() != self._bot_username.lower():
+            return False
+
+        handler = self._command_handlers().get(command.lower())
+        if handler is None:
+            return False
+        return self.dispatch_command(handler, update, CommandContext(self.bot, args))
+
+    async def _handle_webhook_request(self, request):
+        from aiohttp import web
+
+        if self.webhook_secret:
+            token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+            if not hmac.compare_digest(token, self.webhook_secret):
+                logger.warning("⚠️ Webhook request with an invalid secret token")
+                return web.Response(status=403)
+
+        try:
+            data = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+
+        # Answer Telegram right away; the command executor runs updates concurrently
+        try:
+            self.process_update(data)
+        except Exception as e:
+            logger.error(f"❌ Failed to dispatch webhook update: {e}", exc_info=True)
+        return web.Response(text="ok")
+
+    async def start_webhook_server(self, host=TELEGRAM_WEBHOOK_HOST, port=TELEGRAM_WEBHOOK_PORT,
+                                   path=TELEGRAM_WEBHOOK_PATH):
+        """Start the webhook HTTP server on the running loop and return its AppRunner"""
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post(path, self._handle_webhook_request)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"🌐 Webhook սերվերը լսում է {host}:{port}{path}")
+        return runner
+
+    def _serve_webhook(self, warm_up=None, timings=None, started=None):
+        """Serve updates through the webhook server until SIGINT/SIGTERM"""
+        timings = timings if timings is not None else {}
+        started = started if started is not None else time.perf_counter()
+        if warm_up is not None:
+            self._wait_warm_up(warm_up, timings)
+        phase = time.perf_counter()
+        host = TELEGRAM_WEBHOOK_HOST
+        if TELEGRAM_WEBHOOK_URL and not self.webhook_secret:
+            # Never register an unauthenticated webhook: Telegram will send this token with every update
+            self.webhook_secret = secrets.token_urlsafe(32)
+            logger.info("🔐 TELEGRAM_WEBHOOK_SECRET is not set, using a random secret token")
+        elif not self.webhook_secret:
+            # Unauthenticated updates could pause or edit the bot, so keep them local
+            host = '127.0.0.1'
+            logger.warning("⚠️ TELEGRAM_WEBHOOK_SECRET is not set, the webhook server only listens on 127.0.0.1")
+        runner = self.run_sync(self.start_webhook_server(host=host))
+        try:
+            if TELEGRAM_WEBHOOK_URL:
+                self.bot.set_webhook(
+                    url=f"{TELEGRAM_WEBHOOK_URL}{TELEGRAM_WEBHOOK_PATH}",
+                    secret_token=self.webhook_secret or None
+                )
+                if not self._bot_username:
+                    self._bot_username = self.bot.get_me().username
+                logger.info(f"✅ Webhook-ը գրանցված է: {TELEGRAM_WEBHOOK_URL}{TELEGRAM_WEBHOOK_PATH}")
+            timings['webhook'] = time.perf_counter() - phase
+            self._start_metrics()
+            self._mark_ready(timings, started)
+
+            stop = threading.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda signum, frame: stop.set())
+            while not stop.wait(1):
+                pass
         finally:
-            if loop and not loop.is_closed():
+            self.run_sync(runner.cleanup())
+
+    def build_updater(self):
+        """Create the long-polling Updater with all command handlers registered"""
+        # Use v13.x (sync) approach
+        from telegram.ext import Updater, CallbackQueryHandler, CommandHandler
+
+        # Share the bot (and its warmed-up connection pool) with the updater
+        updater = Updater(bot=self.bot, use_context=True)
+        dispatcher = updater.dispatcher
+
+        # For v13.x, we need sync wrappers for async functions.
+        # Handlers are handed to the command executor on the shared
+        # background loop, so the dispatcher thread never waits on the API.
+        def sync_wrapper(async_func):
+            def wrapper(update, context):
                 try:
-                    loop.close()
-                except Exception as close_error:
-                    logger.error(f"❌ Failed to close loop in send_article_sync: {close_error}")
+                    self.dispatch_command(async_func, update, context)
+                except Exception as e:
+                    logger.error(f"❌ Handler error in {async_func.__name__}: {e}", exc_info=True)
+            return wrapper
 
-    def start_bot_server(self):
-        """Start the Telegram bot server to handle commands"""
+        # Add command handlers with sync wrappers
+        for command, handler in self._command_handlers().items():
+            dispatcher.add_handler(CommandHandler(command, sync_wrapper(handler)))
+        for prefix, handler in self._callback_handlers().items():
+            dispatcher.add_handler(CallbackQueryHandler(sync_wrapper(handler), pattern=f"^{re.escape(prefix)}:"))
+        return updater
+
+    async def warm_up(self):
+        """Pre-warm connection pools and caches concurrently; return per-task timings"""
+        loop = asyncio.get_running_loop()
+        timings = {}
+
+        async def timed(name, awaitable):
+            started = time.perf_counter()
+            try:
+                await awaitable
+            except Exception as e:
+                logger.warning(f"⚠️ Pre-warm '{name}' failed: {e}")
+            timings[name] = time.perf_counter() - started
+
+        async def warm_telegram():
+            # Opens the Telegram connection and caches the bot username
+            me = await loop.run_in_executor(None, self.bot.get_me)
+            self._bot_username = me.username
+
+        # The keyword fetch also opens the pooled Django API session
+        await asyncio.gather(
+            timed('keywords', self.keyword_cache.get()),
+            timed('stats', self.get_stats_data()),
+            timed('telegram', warm_telegram()),
+            timed('seen_store', loop.run_in_executor(None, self._get_seen_store)),
+            timed('subscriptions', loop.run_in_executor(None, self._get_subscriptions)),
+            timed('outbox', loop.run_in_executor(None, self._get_outbox)),
+            timed('sources', loop.run_in_executor(None, SOURCE_REGISTRY._maybe_reload)),
+        )
+        return timings
+
+    def _start_warm_up(self):
+        """Run warm_up() on the background loop and return its future"""
+        future = self.submit(self.warm_up())
+        future.add_done_callback(self._log_future_error)
+        return future
+
+    def _wait_warm_up(self, future, timings):
+        """Wait (bounded) for the pre-warm to finish and record its timings"""
+        started = time.perf_counter()
         try:
-            # Use v13.x (sync) approach
-            from telegram.ext import Updater, CommandHandler
-            
-            updater = Updater(token=self.bot_token, use_context=True)
-            dispatcher = updater.dispatcher
-            
-            # For v13.x, we need sync wrappers for async functions
-            def sync_wrapper(async_func):
-                def wrapper(update, context):
-                    loop = None
-                    try:
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        loop.run_until_complete(async_func(update, context))
-                    except Exception as e:
-                        # Միշտ լոգավորեք ամբողջական սխալը՝ հետագա վերլուծության համար
-                        # exc_info=True-ը կապահովի ամբողջական հետագծի տպումը լոգերում
-                        logger.error(f"❌ Handler error in {async_func.__name__}: {e}", exc_info=True)
-                        
-                        # Փորձեք ուղարկել ընդհանուր սխալի հաղորդագրություն օգտատիրոջը
-                        try:
-                            if update and update.message:
-                                chat_id = update.message.chat_id
-                                # Ավելի ընդհանուր, կայուն հաղորդագրություն օգտատիրոջ համար
-                                # Մենք ԱՅԼԵՎՍ ՉԵՆՔ օգտագործում str(e)-ը այստեղ,
-                                # որպեսզի խուսափենք հենց այդ Message օբյեկտի սխալից
-                                user_error_text = "❌ Ծանր սխալ տեղի ունեցավ հրամանը մշակելիս։ Խնդրում ենք փորձել կրկին կամ կապվել ադմինիստրատորի հետ։"
-                                
-                                # Ուղարկեք հաղորդագրությունը սինխրոն requests-ի միջոցով
-                                # (համոզվեք, որ 'import requests' տողը գտնվում է ֆայլի ամենասկզբում)
-                                url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-                                data = {
-                                    'chat_id': chat_id,
-                                    'text': user_error_text
-                                }
-                                requests.post(url, data=data, timeout=5)
-                            else:
-                                logger.warning("Could not send error message: update or update.message is missing.")
-                        except Exception as send_error:
-                            logger.error(f"❌ Failed to send error message to user: {send_error}")
-                    finally:
-                        if loop and not loop.is_closed():
-                            try:
-                                loop.close()
-                            except Exception as close_error:
-                                logger.error(f"❌ Failed to close loop in handler wrapper: {close_error}")
-                return wrapper
-            
-            # Add command handlers with sync wrappers
-            dispatcher.add_handler(CommandHandler("stats", sync_wrapper(self.handle_stats_command)))
-            dispatcher.add_handler(CommandHandler("keywords", sync_wrapper(self.handle_keywords_command)))
-            dispatcher.add_handler(CommandHandler("pause", sync_wrapper(self.handle_pause_command)))
-            dispatcher.add_handler(CommandHandler("resume", sync_wrapper(self.handle_resume_command)))
-            dispatcher.add_handler(CommandHandler("add_keyword", sync_wrapper(self.handle_add_keyword_command)))
-            dispatcher.add_handler(CommandHandler("remove_keyword", sync_wrapper(self.handle_remove_keyword_command)))
-            dispatcher.add_handler(CommandHandler("help", sync_wrapper(self.handle_help_command)))
-            dispatcher.add_handler(CommandHandler("start", sync_wrapper(self.handle_help_command)))
-            
+            timings.update({f"warm_up.{name}": value for name, value in future.result(STARTUP_WARMUP_TIMEOUT).items()})
+        except Exception as e:
+            # Keep starting up; the pre-warm keeps running in the background
+            logger.warning(f"⚠️ Pre-warm is not finished, starting anyway: {e or type(e).__name__}")
+        timings['warm_up.wait'] = time.perf_counter() - started
+
+    def _mark_ready(self, timings, started):
+        """Log the startup timing breakdown and signal readiness"""
+        timings['total'] = time.perf_counter() - started
+        breakdown = ', '.join(f"{name} {value * 1000:.0f}ms" for name, value in timings.items())
+        logger.info(f"⏱️ Startup: {breakdown}")
+        self.ready.set()
+        if not self.notifications_paused and len(self._get_outbox()):
+            # Left over from before a restart
+            self._start_outbox_flush()
+        self._start_article_feed()
+        if BOT_READY_FILE:
+            try:
+                with open(BOT_READY_FILE, 'w') as ready_file:
+                    ready_file.write(f"{os.getpid()}\n")
+            except OSError as e:
+                logger.error(f"❌ Failed to write ready file {BOT_READY_FILE}: {e}")
+        logger.info("✅ Telegram բոտը պատրաստ է")
+
+    def start_bot_server(self, timings=None, started=None):
+        """Start the Telegram bot server to handle commands
+
+        timings/started let the caller include its own startup phases (imports,
+        construction) in the logged breakdown.
+        """
+        timings = dict(timings or {})
+        started = started if started is not None else time.perf_counter()
+        try:
+            # Pre-warm in the background while the update machinery is set up
+            warm_up = self._start_warm_up()
+
+            if TELEGRAM_UPDATE_MODE == 'webhook':
+                try:
+                    logger.info("🤖 Telegram բոտ սերվերը սկսվում է (webhook)...")
+                    self._serve_webhook(warm_up, timings, started)
+                    return
+                except OSError as e:
+                    # e.g. the port is taken; long polling still works
+                    logger.error(f"❌ Webhook սերվերի սխալ, անցում polling-ի: {e}")
+
+            phase = time.perf_counter()
+            updater = self.build_updater()
+            timings['updater'] = time.perf_counter() - phase
+            self._wait_warm_up(warm_up, timings)
+
             # Start the bot
             logger.info("🤖 Telegram բոտ սերվերը սկսվում է...")
+            phase = time.perf_counter()
             updater.start_polling()
+            timings['polling'] = time.perf_counter() - phase
+            self._start_metrics()
+            self._mark_ready(timings, started)
             updater.idle()
             
         except Exception as e:
-            logger.error(f"❌ Telegram բոտ սերվերի սխալ: {e}")
\ No newline at end of file
+            logger.error(f"❌ Telegram բոտ սերվերի սխալ: {e}")
+        finally:
+            self.shutdown()
+
+    def _start_metrics(self):
+        """Start the metrics server; it is not needed for the first poll, so it starts last"""
+        if METRICS_PORT and self._metrics_runner is None:
+            try:
+                self._metrics_runner = self.run_sync(self.start_metrics_server())
+            except OSError as e:
+                logger.error(f"❌ Metrics server failed to start: {e}")
+
+
+def run_notification_worker(worker_id, workers=NOTIFICATION_WORKERS):
+    """Entry point of a notification worker process"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    notifier = TelegramNotifier()
+    # Workers deliver jobs; they never queue new ones
+    notifier.notification_workers = 0
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda signum, frame: stop.set())
+    try:
+        notifier.run_sync(notifier.run_notification_worker(worker_id, workers, stop))
+    finally:
+        notifier.shutdown()
+
+
+class WorkerSupervisor:
+    """Run notification worker processes and restart the ones that exit unexpectedly
+
+    A worker that dies soon after starting is restarted with an exponential
+    backoff, up to WORKER_RESTART_MAX_DELAY seconds.
+    """
+
+    STABLE_AFTER = 30
+
+    def __init__(self, workers=NOTIFICATION_WORKERS, target=run_notification_worker):
+        import multiprocessing
+
+        self.workers = workers
+        self.target = target
+        self._context = multiprocessing.get_context('spawn')
+        self._processes = {}
+        self._started_at = {}
+        self._delays = {}
+        self._restart_at = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _spawn(self, worker_id):
+        process = self._context.Process(
+            target=self.target, args=(worker_id, self.workers),
+            name=f"notification-worker-{worker_id}", daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._started_at[worker_id] = time.monotonic()
+
+    def start(self):
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        self._thread = threading.Thread(target=self._monitor, name="worker-supervisor", daemon=True)
+        self._thread.start()
+        logger.info(f"👷 Started {self.workers} notification workers")
+
+    def _monitor(self):
+        while not self._stop.wait(1):
+            now = time.monotonic()
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive():
+                    continue
+                if worker_id not in self._restart_at:
+                    if now - self._started_at[worker_id] > self.STABLE_AFTER:
+                        self._delays[worker_id] = 1
+                    delay = self._delays.get(worker_id, 1)
+                    self._delays[worker_id] = min(WORKER_RESTART_MAX_DELAY, delay * 2)
+                    self._restart_at[worker_id] = now + delay
+                    logger.warning(f"⚠️ Notification worker {worker_id} exited with code {process.exitcode}, "
+                                   f"restarting in {delay:.0f}s")
+                elif now >= self._restart_at[worker_id] and not self._stop.is_set():
+                    del self._restart_at[worker_id]
+                    self._spawn(worker_id)
+
+    def alive(self):
+        return sum(1 for process in self._processes.values() if process.is_alive())
+
+    def stop(self, timeout=10):
+        """Stop the workers; they finish the notifications they are sending and release their leases"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self._processes.values():
+            process.join(max(0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()